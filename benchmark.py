@@ -0,0 +1,241 @@
+
+"""
+Benchmark of pdf_parser over the pdf files in test_samples.
+
+Times pdf_parser construction, page_parser creation, every find* query type and get_page_stream,
+reports pages/sec and peak memory, and writes machine-readable results which can be compared between runs.
+
+    python benchmark.py --output new.json --compare old.json
+    python benchmark.py --scale 1000 --laparams fast --workers 8
+"""
+
+import os
+import io
+import sys
+import glob
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+
+from PyPDF2 import PdfFileReader, PdfFileWriter
+
+from pdf_parser import pdf_parser, page_parser, row, column, box
+
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_samples')
+
+# Query methods of page_parser, with whether they take a text argument.
+QUERIES = [
+    ('find', True),
+    ('find_all', True),
+    ('find_text_line', True),
+    ('find_text_line_all', True),
+    ('find_rect', False),
+    ('find_rect_all', False),
+    ('find_fig', False),
+    ('find_fig_all', False),
+    ('find_img', False),
+    ('find_img_all', False),
+]
+
+CONSTRAINTS = [None, 'row', 'column', 'box']
+
+def scale_document(data, pages):
+    """
+    Synthesize a larger pdf document by repeating the pages of a sample.
+
+    Args:
+        data (bytes): content of the sample pdf file
+        pages (int): number of pages of the synthesized document
+
+    Returns:
+        bytes of the synthesized pdf document
+    """
+
+    reader = PdfFileReader(io.BytesIO(data))
+    writer = PdfFileWriter()
+    for i in range(pages):
+        writer.addPage(reader.getPage(i % reader.getNumPages()))
+    stream = io.BytesIO()
+    writer.write(stream)
+    return stream.getvalue()
+
+def best_time(func, repeat):
+    """Returns minimum wall time in seconds of repeat calls of func, along with the result of the last call."""
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+def query_boxes(page, count):
+    """Returns count boxes tiling the page in rows, used as constraints of the queries."""
+
+    layout = page.get_layout()
+    height = (layout.y1 - layout.y0) / count
+    width = (layout.x1 - layout.x0) / 2
+    return [box(row(layout.y0 + i * height, layout.y0 + (i + 1) * height), column(layout.x0 + (i % 2) * width, layout.x0 + (i % 2 + 1) * width)) for i in range(count)]
+
+def bench_queries(pages, repeat, count = 20):
+    """Returns mean seconds per call of every query type and constraint over the pages, text queries are left out for pages without extracted text."""
+
+    results = {}
+    for name, has_text in QUERIES:
+        # Text finders raise ValueError on pages whose layout analysis profile skips text extraction, as 'geometry'.
+        query_pages = [page for page in pages if page.text_analysis] if has_text else pages
+        if not query_pages:
+            continue
+        for constraint in CONSTRAINTS:
+            calls = 0
+            def run():
+                nonlocal calls
+                calls = 0
+                for page in query_pages:
+                    method = getattr(page, name)
+                    for mybox in query_boxes(page, count):
+                        kwargs = dict(constraint = constraint, mybox = mybox)
+                        if has_text:
+                            kwargs['text'] = 'the'
+                        method(**kwargs)
+                        calls += 1
+            seconds, _ = best_time(run, repeat)
+            results['%s/%s' % (name, constraint or 'none')] = seconds / max(calls, 1)
+    return results
+
+def bench_document(data, parser_kwargs, repeat):
+    """
+    Benchmark a single pdf document.
+
+    Args:
+        data (bytes): content of the pdf file
+        parser_kwargs (dict): keyword arguments passed to pdf_parser
+        repeat (int): number of runs of each measurement, the fastest is reported
+
+    Returns:
+        dict of measurements
+    """
+
+    construct_s, parser = best_time(lambda: pdf_parser(data, **parser_kwargs), repeat)
+    pages = parser.get_pages()
+    layouts = [page.get_layout() for page in pages]
+
+    page_parser_s, _ = best_time(lambda: [page_parser(layout) for layout in layouts], repeat)
+
+    stream_s, _ = best_time(lambda: [parser.get_page_stream(pageno) for pageno in parser.pagenos], repeat)
+
+    tracemalloc.start()
+    pdf_parser(data, **parser_kwargs).get_pages()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'pages': len(pages),
+        'bytes': len(data),
+        'construct_s': construct_s,
+        'pages_per_s': len(pages) / construct_s if construct_s else None,
+        'page_parser_s': page_parser_s / max(len(pages), 1),
+        'get_page_stream_s': stream_s / max(len(pages), 1),
+        'peak_memory_bytes': peak,
+        'queries_s': bench_queries(pages, repeat),
+    }
+
+def flatten(results, prefix = ''):
+    """Flattens nested dict of measurements into dict of 'a/b/c' keys."""
+
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, prefix + key + '/'))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+def compare(results, baseline, threshold):
+    """
+    Compare measurements against a baseline run.
+
+    Args:
+        results (dict): 'results' of this run
+        baseline (dict): 'results' of the baseline run
+        threshold (float): relative slow down, or increase of peak memory, reported as regression
+
+    Returns:
+        list of (key, baseline value, new value, slow down ratio) tuples of regressions
+    """
+
+    new = flatten(results)
+    old = flatten(baseline)
+    regressions = []
+    for key in sorted(set(new) & set(old)):
+        if not old[key] or not new[key]:
+            continue
+        # Throughput regresses when it drops, times and memory when they grow.
+        if key.endswith('pages_per_s'):
+            ratio = old[key] / new[key]
+        elif key.endswith(('_s', 'peak_memory_bytes')) or '/queries_s/' in key:
+            ratio = new[key] / old[key]
+        else:
+            continue
+        if ratio > 1 + threshold:
+            regressions.append((key, old[key], new[key], ratio))
+    return regressions
+
+def main(argv = None):
+    argparser = argparse.ArgumentParser(description = 'Benchmark pdf_parser over pdf files.')
+    argparser.add_argument('files', nargs = '*', help = 'pdf files to benchmark, defaults to test_samples/*.pdf')
+    argparser.add_argument('--scale', type = int, default = 0, help = 'repeat the pages of every sample up to this many pages')
+    argparser.add_argument('--repeat', type = int, default = 3, help = 'runs of every measurement, the fastest is reported')
+    argparser.add_argument('--laparams', default = 'default', help = 'layout analysis profile passed to pdf_parser, none to skip layout analysis')
+    argparser.add_argument('--workers', type = int, default = None, help = 'worker processes passed to pdf_parser')
+    argparser.add_argument('--compact', action = 'store_true', help = 'store pages as page_layout objects')
+    argparser.add_argument('--output', help = 'write results as json to this file')
+    argparser.add_argument('--compare', help = 'json results of an earlier run to compare against')
+    argparser.add_argument('--threshold', type = float, default = 0.1, help = 'relative slow down reported as regression')
+    args = argparser.parse_args(argv)
+
+    files = args.files or sorted(glob.glob(os.path.join(SAMPLES_DIR, '*.pdf')))
+    parser_kwargs = {'laparams': None if args.laparams == 'none' else args.laparams, 'workers': args.workers, 'compact': args.compact}
+
+    results = {}
+    for path in files:
+        with open(path, 'rb') as f:
+            data = f.read()
+        if args.scale:
+            data = scale_document(data, args.scale)
+        name = os.path.basename(path)
+        results[name] = bench_document(data, parser_kwargs, args.repeat)
+        r = results[name]
+        print('%-32s %5d pages  construct %8.3fs  %8.1f pages/s  peak %7.1f MiB  stream %.4fs/page' % (
+            name, r['pages'], r['construct_s'], r['pages_per_s'] or 0, r['peak_memory_bytes'] / 2 ** 20, r['get_page_stream_s']))
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'args': vars(args),
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent = 2, sort_keys = True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], args.threshold)
+        for key, old, new, ratio in regressions:
+            print('REGRESSION %-60s %.6g -> %.6g (x%.2f)' % (key, old, new, ratio))
+        if regressions:
+            return 1
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,17 +1,53 @@
 
 import os
+import sys
+import array
 import re
 import io
 import tempfile
+import hashlib
+import marshal
+import functools
+import bisect
+import mmap
+import asyncio
+import threading
+import time
+import struct
+import zlib
 
-from pdfminer.layout import LTPage, LTText, LAParams, LTTextBox, LTRect, LTLine, LTFigure, LTImage, LTTextLine, LTChar
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from pdfminer.layout import LTPage, LTText, LTContainer, LAParams, LTTextBox, LTRect, LTLine, LTFigure, LTImage, LTTextLine, LTChar
 from pdfminer.pdfpage import PDFPage
 from pdfminer.pdfinterp import PDFResourceManager
 from pdfminer.pdfinterp import PDFPageInterpreter
 from pdfminer.converter import PDFPageAggregator
+from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1, LITERALS_DCT_DECODE, LITERALS_JPX_DECODE, LITERALS_JBIG2_DECODE
+from pdfminer.psparser import PSLiteral, LIT, literal_name
 
 from PyPDF2 import PdfFileReader, PdfFileWriter
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+    
+try:
+    from PIL import Image as pil_image
+except ImportError:
+    pil_image = None
+    
+LITERAL_IMAGE = LIT('Image')
+LITERAL_FORM = LIT('Form')
+LITERAL_ICC_BASED = LIT('ICCBased')
+
 
 class PageNotFoundError(Exception):
     """Exception class for accessing not existing page from a pdf_parser object."""
@@ -19,311 +55,2227 @@ class PageNotFoundError(Exception):
 
 class row():
     """Row bound by lower and upper y-coordinates."""
+    __slots__ = ('y0', 'y1')
     def __init__(self, y0 = -1, y1 = -1):
         self.y0 = y0
         self.y1 = y1
 
 class column():
     """Column bound by left and right x-coordinates."""
+    __slots__ = ('x0', 'x1')
     def __init__(self, x0 = -1, x1 = -1):
         self.x0 = x0
         self.x1 = x1
         
 class box():
     """Box bound by a given row and column."""
+    __slots__ = ('myrow', 'mycolumn')
     def __init__(self, myrow = row(), mycolumn = column()):
         self.myrow = myrow
         self.mycolumn = mycolumn
         
 class text_box():
     """TextBox bound by a box and containing some text."""
+    __slots__ = ('text', 'myrow', 'mycolumn', 'mybox', 'mybbox')
     def __init__(self, lobj):
         self.text = lobj.get_text()
-        self.myrow = row(lobj.x0, lobj.x1)
-        self.mycolumn = column(lobj.y0, lobj.y1)
-        self.mybox = box(self.row, self.column)
+        self.myrow = row(lobj.y0, lobj.y1)
+        self.mycolumn = column(lobj.x0, lobj.x1)
+        self.mybox = box(self.myrow, self.mycolumn)
         self.mybbox = lobj.bbox
         
 def get_lt_texts(lts):
+    """
+    Get text boxes of the groups of characters lying in the given LT objects, as in figures where pdfminer does no layout analysis.
+    Walks the objects iteratively in a single pass, so arbitrarily deep nesting of figures is handled without recursion.
+    
+    Args:
+        lts (iterable): LT objects, usually LTFigure objects, to search in
+        
+    Returns:
+        list of LTTextBox objects, one per container holding only LTChar objects, in document order
+    """
+    
     if isinstance(lts, LTText):
         return []
-    
-    lt_texts = []
     try:
-        list(lts)
-    except:
+        stack = [iter(lts)]
+    except TypeError:
         return []
-    for ltobj in lts:
-        try:
-            list(ltobj)
-        except:
-            continue
-        if check_text_group(ltobj):
-            lt_texts.append(get_LTTextBox(ltobj))
+    
+    lt_texts = []
+    while stack:
+        for ltobj in stack[-1]:
+            if not isinstance(ltobj, LTContainer):
+                continue
+            if check_text_group(ltobj):
+                lt_texts.append(_chars_to_text_box(ltobj))
+            elif not isinstance(ltobj, LTText):
+                stack.append(iter(ltobj))
+                break
         else:
-            lt_texts.extend(get_lt_texts(ltobj))
-    return lt_texts  
+            stack.pop()
+    return lt_texts
+
+def get_lt_text_boxes(lts):
+    """
+    Get text boxes pdfminer grouped inside figures, as it does when LAParams has all_texts set, also inside figures nested in figures.
+    
+    Args:
+        lts (iterable): LT objects, usually LTFigure objects, to search in
+        
+    Returns:
+        list of LTTextBox objects, in document order
+    """
+    
+    lt_text_boxes = []
+    stack = [iter(lts)]
+    while stack:
+        for ltobj in stack[-1]:
+            if isinstance(ltobj, LTTextBox):
+                lt_text_boxes.append(ltobj)
+            elif isinstance(ltobj, LTFigure):
+                stack.append(iter(ltobj))
+                break
+        else:
+            stack.pop()
+    return lt_text_boxes
 
 def check_text_group(ltobj):
-    return all([isinstance(i, LTChar) for i in list(ltobj)])
+    return all(isinstance(i, LTChar) for i in ltobj)
 
-def get_LTTextBox(ltobj):
+def _chars_to_text_box(ltobj):
     lt_text_obj = LTTextBox()
     lt_text_obj.set_bbox(ltobj.bbox)
-    
+    for lt_char in ltobj:
+        lt_text_obj.add(lt_char)
+    return lt_text_obj
+
+def get_LTTextBox(ltobj):
     if check_text_group(ltobj):
-        for lt_char in list(ltobj):
-            lt_text_obj.add(lt_char)
-        
+        return _chars_to_text_box(ltobj)
+    
+    lt_text_obj = LTTextBox()
+    lt_text_obj.set_bbox(ltobj.bbox)
     return lt_text_obj    
         
+
+class page_object():
+    """
+    Compact layout object of a page holding only its kind, bounding box, text and children.
+    Kind is one of 'text_box', 'text_line', 'char', 'rect', 'line', 'figure', 'image' and 'other'.
+    """
+    
+    __slots__ = ('kind', 'x0', 'y0', 'x1', 'y1', 'text', 'children')
+    
+    def __init__(self, kind, bbox = (-1, -1, -1, -1), text = '', children = ()):
+        self.kind = kind
+        self.set_bbox(bbox)
+        self.text = text
+        self.children = children
+        
+    def __repr__(self):
+        return '<page_object(%s) %.3f,%.3f,%.3f,%.3f %r>' % (self.kind, self.x0, self.y0, self.x1, self.y1, self.get_text())
+    
+    def __iter__(self):
+        return iter(self.children)
+    
+    def __len__(self):
+        return len(self.children)
+    
+    @property
+    def bbox(self):
+        return (self.x0, self.y0, self.x1, self.y1)
+    
+    @property
+    def width(self):
+        return self.x1 - self.x0
+    
+    @property
+    def height(self):
+        return self.y1 - self.y0
+    
+    def set_bbox(self, bbox):
+        (self.x0, self.y0, self.x1, self.y1) = bbox
+        
+    def get_text(self):
+        # Text of a text box with text lines is not stored twice, but joined from its lines.
+        if self.text is None:
+            return ''.join(child.get_text() for child in self.children)
+        return self.text
+    
+    def is_hoverlap(self, obj):
+        return obj.x0 <= self.x1 and self.x0 <= obj.x1
+    
+    def is_voverlap(self, obj):
+        return obj.y0 <= self.y1 and self.y0 <= obj.y1
+    
+class page_layout():
+    """Compact replacement of LTPage holding page_object children, which page_parser accepts as layout."""
+    
+    __slots__ = ('pageid', 'x0', 'y0', 'x1', 'y1', 'rotate', 'objs')
+    
+    def __init__(self, pageid, bbox, rotate = 0, objs = ()):
+        self.pageid = pageid
+        (self.x0, self.y0, self.x1, self.y1) = bbox
+        self.rotate = rotate
+        self.objs = objs
+        
+    def __repr__(self):
+        return '<page_layout(%s) %.3f,%.3f,%.3f,%.3f rotate=%r>' % (self.pageid, self.x0, self.y0, self.x1, self.y1, self.rotate)
+    
+    def __iter__(self):
+        return iter(self.objs)
+    
+    def __len__(self):
+        return len(self.objs)
+    
+    @property
+    def bbox(self):
+        return (self.x0, self.y0, self.x1, self.y1)
+    
+    @property
+    def width(self):
+        return self.x1 - self.x0
+    
+    @property
+    def height(self):
+        return self.y1 - self.y0
+    
+# Pillow image modes of the device color spaces, by number of color components.
+IMAGE_MODES = {1: 'L', 3: 'RGB', 4: 'CMYK'}
+
+def _colorspace_components(colorspace):
+    """Returns name and number of color components of a ColorSpace entry of an image, the number being None if not known."""
+    
+    spec = resolve1(colorspace)
+    if isinstance(spec, list):
+        name = resolve1(spec[0]) if spec else None
+        if name is LITERAL_ICC_BASED and len(spec) > 1:
+            return 'ICCBased', resolve1(resolve1(spec[1]).get('N'))
+        return (name.name if isinstance(name, PSLiteral) else None), None
+    if isinstance(spec, PSLiteral):
+        return spec.name, {'DeviceGray': 1, 'CalGray': 1, 'DeviceRGB': 3, 'CalRGB': 3, 'DeviceCMYK': 4}.get(spec.name)
+    return None, None
+
+def _image_mode(colorspace, bits):
+    """Returns Pillow image mode of raw samples of an image with the ColorSpace entry and bits per component, else None if not supported."""
+    
+    _, components = _colorspace_components(colorspace)
+    if bits == 1 and components == 1:
+        return '1'
+    if bits != 8:
+        return None
+    return IMAGE_MODES.get(components)
+
+def _image_format(filters):
+    """Returns format of the data of an image stream with the filter names after pdfminer decoded it: 'jpeg', 'jp2', 'jbig2' or 'raw' samples."""
+    
+    last = LIT(filters[-1]) if filters else None
+    if last in LITERALS_DCT_DECODE:
+        return 'jpeg'
+    if last in LITERALS_JPX_DECODE:
+        return 'jp2'
+    if last in LITERALS_JBIG2_DECODE:
+        return 'jbig2'
+    return 'raw'
+
+def _resolve_uncached(obj):
+    """Resolves a PDFObjRef without storing the object in the cache of its document, so a large stream is released after use."""
+    
+    doc = getattr(obj, 'doc', None)
+    if not isinstance(obj, PDFObjRef) or doc is None:
+        return resolve1(obj)
+    
+    caching = doc.caching
+    doc.caching = False
+    try:
+        return resolve1(obj)
+    finally:
+        doc.caching = caching
         
-class page_parser():
+def _release_contents(pdf_page):
     """
-    Page_parser class for parsing functionality of a particular page of a pdf file, with help of LTPage object from pdfminer.layout module.
+    Drops the content streams of a page, which keep their decoded data once the page is analyzed, from the page and from the object cache
+    of its document, so they are released with the layout of the page. _load_contents parses them again if the page is analyzed again.
+    """
+    
+    for stream in pdf_page.contents or ():
+        if isinstance(stream, PDFStream) and stream.objid is not None:
+            pdf_page.doc._cached_objs.pop(stream.objid, None)
+    pdf_page.contents = None
+    
+def _load_contents(pdf_page):
+    """Parses the content streams of a page released by _release_contents again, without keeping them in the object cache of its document."""
+    
+    if pdf_page.contents is None:
+        contents = _resolve_uncached(pdf_page.attrs.get('Contents'))
+        if contents is None:
+            contents = []
+        elif not isinstance(contents, list):
+            contents = [contents]
+        pdf_page.contents = [_resolve_uncached(obj) for obj in contents]
+    return pdf_page
+        
+class _image_interpreter(PDFPageInterpreter):
+    """
+    PDFPageInterpreter which does not keep image XObject streams in the cache of the document,
+    so the encoded image data is held only as long as the LTImage objects of the layout.
+    """
+    
+    def do_Do(self, xobjid_arg):
+        xobjid = literal_name(xobjid_arg)
+        ref = self.xobjmap.get(xobjid)
+        if isinstance(ref, PDFObjRef):
+            xobj = _resolve_uncached(ref)
+            if isinstance(xobj, PDFStream) and xobj.get('Subtype') is LITERAL_IMAGE:
+                self.xobjmap[xobjid] = xobj
+                try:
+                    return PDFPageInterpreter.do_Do(self, xobjid_arg)
+                finally:
+                    self.xobjmap[xobjid] = ref
+        return PDFPageInterpreter.do_Do(self, xobjid_arg)
+    
+class image_object(page_object):
     """
+    Compact image of a page keeping its metadata but not its data, which pdf_parser.get_image_data loads on demand by object id.
+    Only inline images, which have no object id, keep their decoded data.
+    """
+    
+    __slots__ = ('name', 'srcsize', 'bits', 'colorspace', 'mode', 'filters', 'objid', 'data')
     
-    def __init__(self, layout):
+    def __init__(self, bbox, name = None, srcsize = (None, None), bits = None, colorspace = None, mode = None, filters = (), objid = None, data = None):
         """
-        Takes LTPage object and initializes list of children LT objects from that page.
+        Args:
+            bbox (tuple): bounding box of the image on the page
+            name (str): name of the image XObject
+            srcsize (tuple): width and height of the image in pixels
+            bits (int): bits per color component
+            colorspace (str): name of the color space
+            mode (str): Pillow image mode of raw samples of the image, None if not supported
+            filters (tuple): names of the filters of the image stream
+            objid (int): object id of the image stream, None for an inline image
+            data (bytes): decoded data of an inline image
         """
         
-        self.layout = layout
-        self.lobjs_all = list(layout)
-        self.lobjs_text = []
-        self.lobjs_text_line = []
-        self.lobjs_rect = []
-        self.lobjs_line = []
-        self.lobjs_fig = []
-        self.lobjs_img = []
+        page_object.__init__(self, 'image', bbox)
+        self.name = name
+        self.srcsize = srcsize
+        self.bits = bits
+        self.colorspace = colorspace
+        self.mode = mode
+        self.filters = filters
+        self.objid = objid
+        self.data = data
+        
+    def __repr__(self):
+        return '<image_object(%s) %.3f,%.3f,%.3f,%.3f %r %s>' % (self.name, self.x0, self.y0, self.x1, self.y1, self.srcsize, self.get_format())
+    
+    @classmethod
+    def from_lt_image(cls, lt_image):
+        """Get image_object of a LTImage object, without its data unless it is an inline image."""
+        
+        stream = lt_image.stream
+        filters = tuple(f.name for f, _ in stream.get_filters() if isinstance(f, PSLiteral))
+        colorspace, _ = _colorspace_components(stream.get_any(('CS', 'ColorSpace')))
+        mode = _image_mode(stream.get_any(('CS', 'ColorSpace')), lt_image.bits)
+        objid = stream.objid
+        data = None
+        if objid is None:
+            data = stream.get_data()
+            filters = filters[-1:] if _image_format(filters) != 'raw' else ()
+        return cls(lt_image.bbox, lt_image.name, tuple(lt_image.srcsize), lt_image.bits, colorspace, mode, filters, objid, data)
+    
+    def get_format(self):
+        """Get format of the decoded data of the image, 'jpeg', 'jp2', 'jbig2' or 'raw' samples."""
         
-        for lobj in self.lobjs_all:
-            if isinstance(lobj, LTText):
-                self.lobjs_text.append(lobj)
+        return _image_format(self.filters)
+    
+def _png_bytes(data, width, height, mode, alpha = None):
+    """
+    Returns PNG file of raw samples of an image in '1', 'L' or 'RGB' mode, with 8 bit alpha samples for 'L' and 'RGB' if given,
+    else None if the data is too short.
+    """
+    
+    bit_depth, color_type, channels = {'1': (1, 0, 1), 'L': (8, 0, 1), 'RGB': (8, 2, 3)}[mode]
+    stride = (width * channels * bit_depth + 7) // 8
+    if len(data) < stride * height or (alpha is not None and len(alpha) < width * height):
+        return None
+    
+    if alpha is not None:
+        # Alpha is interleaved as the last channel of every pixel, PNG color types 4 and 6.
+        count = width * height
+        pixels = bytearray(count * (channels + 1))
+        for channel in range(channels):
+            pixels[channel::channels + 1] = data[channel:count * channels:channels]
+        pixels[channels::channels + 1] = alpha[:count]
+        data = pixels
+        color_type += 4
+        channels += 1
+        stride = width * channels
+    
+    scanlines = b''.join(b'\x00' + data[y * stride:(y + 1) * stride] for y in range(height))
+    
+    def chunk(tag, body):
+        return struct.pack('>I', len(body)) + tag + body + struct.pack('>I', zlib.crc32(tag + body) & 0xffffffff)
+    
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, bit_depth, color_type, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(scanlines)) + chunk(b'IEND', b''))
+
+# Translation table inverting 8 bit samples, and 1 bit samples 8 at a time.
+_INVERT = bytes(range(255, -1, -1))
+
+def _apply_decode(data, decode, components):
+    """Returns samples of an image with its Decode array applied, else None if the array neither keeps nor inverts the samples."""
+    
+    decode = [resolve1(value) for value in resolve1(decode)] if decode is not None else None
+    if decode is None or decode == [0, 1] * components:
+        return data
+    if decode == [1, 0] * components:
+        return data.translate(_INVERT)
+    return None
+
+def _smask_samples(smask, width, height):
+    """Returns 8 bit alpha samples of the soft mask of an image of the size, else None if the soft mask is not supported."""
+    
+    smask = _resolve_uncached(smask)
+    if not isinstance(smask, PDFStream) or 'Matte' in smask:
+        return None
+    filters = [f.name for f, _ in smask.get_filters() if isinstance(f, PSLiteral)]
+    if _image_format(filters) != 'raw' or 'CCITTFaxDecode' in filters:
+        return None
+    if (resolve1(smask.get('Width')), resolve1(smask.get('Height'))) != (width, height) or resolve1(smask.get_any(('BPC', 'BitsPerComponent'))) != 8:
+        return None
+    return _apply_decode(smask.get_data(), smask.get_any(('D', 'Decode')), 1)
+
+def _image_png(stream, data):
+    """
+    Returns PNG file of an image stream of grayscale, RGB or bilevel samples, with its Decode array and 8 bit soft mask applied,
+    else None for other images and for Decode arrays, masks and soft masks which can not be applied.
+    """
+    
+    filters = [f.name for f, _ in stream.get_filters() if isinstance(f, PSLiteral)]
+    if _image_format(filters) != 'raw' or 'CCITTFaxDecode' in filters or 'Mask' in stream:
+        return None
+    mode = _image_mode(stream.get_any(('CS', 'ColorSpace')), resolve1(stream.get_any(('BPC', 'BitsPerComponent'))))
+    if mode not in ('1', 'L', 'RGB'):
+        return None
+    
+    width, height = resolve1(stream.get('Width')), resolve1(stream.get('Height'))
+    data = _apply_decode(data, stream.get_any(('D', 'Decode')), 3 if mode == 'RGB' else 1)
+    if data is None:
+        return None
+    
+    alpha = None
+    if stream.get('SMask') is not None:
+        alpha = _smask_samples(stream['SMask'], width, height) if mode != '1' else None
+        if alpha is None:
+            return None
+    return _png_bytes(data, width, height, mode, alpha)
+
+def _compact_chars(lobj):
+    return tuple(page_object('char', char.bbox, char.get_text()) for char in lobj if isinstance(char, LTChar))
+
+def _compact_text_box(lobj, keep_chars):
+    lines = tuple(page_object('text_line', line.bbox, line.get_text(), _compact_chars(line) if keep_chars else ()) for line in lobj if isinstance(line, LTTextLine))
+    return page_object('text_box', lobj.bbox, None if lines else lobj.get_text(), lines)
+
+def compact_layout(layout, keep_chars = False, text_analysis = True):
+    """
+    Converts an LTPage object into a page_layout object, dropping everything page_parser does not use.
+    
+    Args:
+        layout (LTPage): analyzed page from pdfminer
+        keep_chars (bool): if True, text lines and figure texts keep their characters as 'char' children with bbox and text
+        text_analysis (bool): if False, as without layout analysis, characters in figures are not grouped into figure texts either
+        
+    Returns:
+        page_layout object of that page
+    """
+    
+    objs = []
+    for lobj in layout:
+        if isinstance(lobj, LTChar):
+            objs.append(page_object('char', lobj.bbox, lobj.get_text()))
             
-            if isinstance(lobj, LTRect):
-                self.lobjs_rect.append(lobj)
+        elif isinstance(lobj, LTText):
+            objs.append(_compact_text_box(lobj, keep_chars))
             
-            elif isinstance(lobj, LTLine):
-                self.lobjs_line.append(lobj)
+        elif isinstance(lobj, LTRect):
+            objs.append(page_object('rect', lobj.bbox))
+            
+        elif isinstance(lobj, LTLine):
+            objs.append(page_object('line', lobj.bbox))
+            
+        elif isinstance(lobj, LTFigure):
+            children = [image_object.from_lt_image(child) for child in lobj if isinstance(child, LTImage)]
+            if text_analysis:
+                children.extend(page_object('text_box', text.bbox, text.get_text(), _compact_chars(text) if keep_chars else ()) for text in get_lt_texts([lobj]))
+                # Text boxes of figures analyzed by pdfminer keep their text lines, unlike the groups of characters above.
+                children.extend(_compact_text_box(text_box, keep_chars) for text_box in get_lt_text_boxes([lobj]))
+            objs.append(page_object('figure', lobj.bbox, children = tuple(children)))
+            
+        else:
+            objs.append(page_object('other', lobj.bbox))
+            
+    return page_layout(layout.pageid, layout.bbox, layout.rotate, tuple(objs))
+        
+def _layout_to_tuple(layout):
+    """Converts a page_layout object into nested tuples of builtin types."""
+    
+    def obj_to_tuple(lobj):
+        if isinstance(lobj, image_object):
+            return (lobj.kind, lobj.bbox, lobj.text, (), (lobj.name, lobj.srcsize, lobj.bits, lobj.colorspace, lobj.mode, lobj.filters, lobj.objid, lobj.data))
+        return (lobj.kind, lobj.bbox, lobj.text, tuple(obj_to_tuple(child) for child in lobj.children))
+    
+    return (layout.pageid, layout.bbox, layout.rotate, tuple(obj_to_tuple(lobj) for lobj in layout.objs))
 
-            elif isinstance(lobj, LTFigure):
-                self.lobjs_fig.append(lobj)
-                
-        for lobj_fig in self.lobjs_fig:
-            for lobj in list(lobj_fig):
-                if isinstance(lobj, LTImage):
-                    self.lobjs_img.append(lobj)
-                    
-        for lobj_text in self.lobjs_text:
-            for lobj in list(lobj_text):
-                if isinstance(lobj, LTTextLine):
-                    self.lobjs_text_line.append(lobj)
-                        
-        self.lobjs_text.extend(get_lt_texts(self.lobjs_fig))
-        self.lobjs_text_line.extend(get_lt_texts(self.lobjs_fig))
-                    
-                    
-    def get_layout(self):
-        return self.layout
-                
-    def find(self, text = '', constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+def _layout_from_tuple(data):
+    """Converts nested tuples made by _layout_to_tuple back into a page_layout object."""
+    
+    def obj_from_tuple(obj):
+        # Images carry their metadata as fifth item.
+        if len(obj) > 4:
+            return image_object(obj[1], *obj[4])
+        return page_object(obj[0], obj[1], obj[2], tuple(obj_from_tuple(child) for child in obj[3]))
+    
+    return page_layout(data[0], data[1], data[2], tuple(obj_from_tuple(obj) for obj in data[3]))
+
+class layout_cache():
+    """
+    Persistent on-disk cache of page_layout objects, keyed by content hash of the document, LAParams values and page index.
+    Least recently used entries are evicted once the total size of the cache exceeds max_size.
+    """
+    
+    def __init__(self, directory, max_size = 256 * 1024 * 1024):
         """
-        Find a text_box containing  particular string within constraints.
-        
         Args:
-            text (str): text to searched
-            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
-            mybox (box): box object for searching within a particular box
-            myrow (row): row object to constrain the search to a particular row
-            mycolumn (column): column object to constrain the search to a particular column
-            
-        Returns:
-            found LTTextBox object
+            directory (str): directory in which cached pages are stored, created if not existing
+            max_size (int): maximum total size of the cached pages in bytes
         """
         
-        bbox = LTTextBox()
-        if constraint == None:
-            for lobj in self.lobjs_text:
-                if text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split())):
-                    return lobj
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok = True)
+        self.size = sum(entry.stat().st_size for entry in os.scandir(directory) if entry.name.endswith('.page'))
         
-        elif constraint == 'row':
-            bbox.set_bbox((-1, myrow.y0, -1, myrow.y1))
-
-            for lobj in self.lobjs_text:
-                if bbox.is_voverlap(lobj) and (text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split()))):
-                     return lobj
+    def make_key(self, doc_hash, laparams, pageno, keep_chars = False):
+        """Returns cache key of a page of the document with given content hash analyzed with given LAParams."""
         
-        elif constraint == 'column':
-            bbox.set_bbox((mycolumn.x0, -1, mycolumn.x1, -1))
-             
-            for lobj in self.lobjs_text:
-                if bbox.is_hoverlap(lobj) and (text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split()))):
-                    return lobj
-             
-        elif constraint == 'box':
-            if mybox != None:
-                myrow = mybox.myrow
-                mycolumn = mybox.mycolumn
-             
-            bbox.set_bbox((mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
-             
-            for lobj in self.lobjs_text:
-                if bbox.is_hoverlap(lobj) and bbox.is_voverlap(lobj) and (text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split()))):
-                    return lobj
-                
-    def find_all(self, text = '', constraint = None, mybox = None, myrow = row(), mycolumn = column()):
-        """
-        Find all text_box containing  particular string within constraints.
+        params = sorted(vars(laparams).items()) if laparams is not None else None
+        return hashlib.sha256(('%s|%r|%d|%r|%d' % (doc_hash, params, pageno, keep_chars, marshal.version)).encode()).hexdigest()
+    
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.page')
+    
+    def __contains__(self, key):
+        """Returns whether a page is cached under the key, without loading it or updating its access time."""
         
-        Args:
-            text (str): text to searched
-            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
-            mybox (box): box object for searching within a particular box
-            myrow (row): row object to constrain the search to a particular row
-            mycolumn (column): column object to constrain the search to a particular column
-            
-        Returns:
-            list of found LTTextBox objects
-        """
+        return os.path.exists(self._path(key))
+    
+    def get(self, key):
+        """Returns cached page_layout object for the key, else None."""
         
-        bbox = LTTextBox()
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
         
-        lobjs = []
+        # Modification time is used as last access time for the LRU eviction.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return _layout_from_tuple(data)
+    
+    def put(self, key, layout):
+        """Stores a page_layout object under the key and evicts least recently used pages if cache is full."""
         
-        if constraint == None:
-            for lobj in self.lobjs_text:
-                if text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split())):
-                    lobjs.append(lobj)
+        data = marshal.dumps(_layout_to_tuple(layout))
+        path = self._path(key)
+        try:
+            old_size = os.stat(path).st_size
+        except OSError:
+            old_size = 0
+            
+        fd, tmp_path = tempfile.mkstemp(dir = self.directory, suffix = '.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        finally:
+            # Only left when writing or replacing failed.
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        self.size += len(data) - old_size
+        if self.size > self.max_size:
+            self._evict()
+            
+    def _evict(self):
+        """Deletes least recently used pages until the cache fits in max_size."""
+        
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.page'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        
+        self.size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self.size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.size -= size
+            
+class buffer_reader(io.RawIOBase):
+    """Read-only seekable file object over a bytes-like buffer, like a memory-map, copying only the ranges which are read."""
+    
+    def __init__(self, buffer):
+        self.buffer = memoryview(buffer).cast('B')
+        self.pos = 0
         
-        elif constraint == 'row':
-            bbox.set_bbox((-1, myrow.y0, -1, myrow.y1))
-
-            for lobj in self.lobjs_text:
-                if bbox.is_voverlap(lobj) and (text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split()))):
-                     lobjs.append(lobj)
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def tell(self):
+        return self.pos
+    
+    def seek(self, offset, whence = io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.pos
+        elif whence == io.SEEK_END:
+            offset += len(self.buffer)
+        if offset < 0:
+            raise ValueError('negative seek position %d' % offset)
+        self.pos = offset
+        return self.pos
+    
+    def read(self, size = -1):
+        end = len(self.buffer) if size is None or size < 0 else self.pos + size
+        data = self.buffer[self.pos:end].tobytes()
+        self.pos += len(data)
+        return data
+    
+    def readinto(self, b):
+        data = self.buffer[self.pos:self.pos + len(b)]
+        b[:len(data)] = data
+        self.pos += len(data)
+        return len(data)
+    
+    def close(self):
+        if not self.closed:
+            self.buffer.release()
+        super().close()
         
-        elif constraint == 'column':
-            bbox.set_bbox((mycolumn.x0, -1, mycolumn.x1, -1))
-             
-            for lobj in self.lobjs_text:
-                if bbox.is_hoverlap(lobj) and (text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split()))):
-                    lobjs.append(lobj)
-             
-        elif constraint == 'box':
-            if mybox != None:
-                myrow = mybox.myrow
-                mycolumn = mybox.mycolumn
-             
-            bbox.set_bbox((mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
-             
-            for lobj in self.lobjs_text:
-                if bbox.is_hoverlap(lobj) and bbox.is_voverlap(lobj) and (text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split()))):
-                    lobjs.append(lobj)
-                    
-        return lobjs
+def open_pdf_source(source):
+    """
+    Opens a pdf source for reading without copying its content.
     
-    def find_text_line(self, text = '', constraint = None, mybox = None, myrow = row(), mycolumn = column()):
-        """
-        Find a text_line containing  particular string within constraints.
+    Args:
+        source (str, bytes or file): path of the pdf file, which is memory-mapped, bytes-like buffer holding the pdf file, or file-pointer which is used as is
         
+    Returns:
+        tuple of file-pointer to read from and list of objects opened here, to be closed in reverse order when done
+    """
+    
+    opened = []
+    if isinstance(source, (str, os.PathLike)):
+        f = open(source, 'rb')
+        opened.append(f)
+        # An empty file can not be memory-mapped, pdfminer reports it as invalid pdf.
+        if os.fstat(f.fileno()).st_size == 0:
+            return f, opened
+        source = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+        opened.append(source)
+        
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        source = buffer_reader(source)
+        opened.append(source)
+        
+    return source, opened
+
+class layout_store():
+    """
+    Page layouts of a parsed document in a compact columnar binary format, which is memory-mapped when read from a path.
+    
+    The file starts with a header of the magic bytes, number of pages, number of objects, size of the text blob and size of the
+    extra data, followed by 8 byte aligned little-endian arrays: page numbers, page bounding boxes, page rotations, index of the
+    first object of each page, kind codes, parent indices, bounding boxes and text offsets of all objects in pre-order,
+    the utf-8 text blob and marshalled extra data holding the number of pages of the document, page ids and image metadata.
+    """
+    
+    MAGIC = b'PDFPCOL1'
+    HEADER = struct.Struct('<8sIIQQ')
+    KINDS = ('text_box', 'text_line', 'char', 'rect', 'line', 'figure', 'image', 'other')
+    
+    # Type codes and item counts, as multiples of the number of pages or objects plus a constant, of the arrays in file order.
+    COLUMNS = (
+        ('page_numbers', 'i', 'pages', 1, 0),
+        ('page_bboxes', 'd', 'pages', 4, 0),
+        ('page_rotates', 'i', 'pages', 1, 0),
+        ('page_starts', 'q', 'pages', 1, 1),
+        ('kinds', 'B', 'objs', 1, 0),
+        ('parents', 'q', 'objs', 1, 0),
+        ('bboxes', 'd', 'objs', 4, 0),
+        ('text_starts', 'q', 'objs', 1, 1),
+    )
+    
+    def __init__(self, source):
+        """
         Args:
-            text (str): text to searched
-            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
-            mybox (box): box object for searching within a particular box
-            myrow (row): row object to constrain the search to a particular row
-            mycolumn (column): column object to constrain the search to a particular column
-            
-        Returns:
-            found LTTextLine object
+            source (str or bytes): path of a file written by layout_store.write, which is memory-mapped, or bytes-like buffer holding it
         """
         
-        bbox = LTTextBox()
-        
-        if constraint == None:
-            for lobj in self.lobjs_text_line:
-                
-                if text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split())):
-                    
-                    return lobj
+        fp, self._opened = open_pdf_source(source)
+        buffer = fp.buffer if isinstance(fp, buffer_reader) else memoryview(fp.read())
+        
+        magic, npages, nobjs, text_size, extra_size = self.HEADER.unpack_from(buffer, 0)
+        if magic != self.MAGIC:
+            raise ValueError('Not a layout_store file')
+        
+        offset = self.HEADER.size
+        counts = {'pages': npages, 'objs': nobjs}
+        for name, typecode, count, per_item, extra_items in self.COLUMNS:
+            size = (counts[count] * per_item + extra_items) * array.array(typecode).itemsize
+            column = buffer[offset:offset + size]
+            if sys.byteorder != 'little' and typecode != 'B':
+                swapped = array.array(typecode, column.tobytes())
+                swapped.byteswap()
+                column = memoryview(swapped)
+            setattr(self, name, column.cast(typecode))
+            offset += -(-size // 8) * 8
+            
+        self.texts = buffer[offset:offset + text_size]
+        offset += -(-text_size // 8) * 8
+        extra = marshal.loads(buffer[offset:offset + extra_size])
+        
+        self.no_pages = extra['no_pages']
+        self.keep_chars = extra['keep_chars']
+        self.pageids = extra['pageids']
+        self.images = extra['images']
+        self.index = dict((pageno, i) for i, pageno in enumerate(self.page_numbers))
+        
+    def close(self):
+        """Releases the arrays and closes the file and memory-map opened for a path or buffer source."""
+        
+        # The memory-map can only be closed once no view of it is left.
+        for name, _, _, _, _ in self.COLUMNS:
+            getattr(self, name).release()
+        self.texts.release()
+        for opened in reversed(self._opened):
+            opened.close()
+        self._opened = []
+        
+    @property
+    def pagenos(self):
+        return list(self.page_numbers)
+    
+    def get_layout(self, pageno):
+        """Get page_layout object of a stored page, built from the arrays."""
         
-        elif constraint == 'row':
-            bbox.set_bbox((-1, myrow.y0, -1, myrow.y1))
-
-            for lobj in self.lobjs_text_line:
-                if bbox.is_voverlap(lobj) and (text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split()))):
-                     return lobj
+        p = self.index[pageno]
+        start, end = self.page_starts[p], self.page_starts[p + 1]
+        kinds, parents, bboxes, text_starts, texts = self.kinds, self.parents, self.bboxes, self.text_starts, self.texts
         
-        elif constraint == 'column':
-            bbox.set_bbox((mycolumn.x0, -1, mycolumn.x1, -1))
-             
-            for lobj in self.lobjs_text_line:
-                if bbox.is_hoverlap(lobj) and (text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split()))):
-                    return lobj
-             
-        elif constraint == 'box':
-            if mybox != None:
-                myrow = mybox.myrow
-                mycolumn = mybox.mycolumn
-             
-            bbox.set_bbox((mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
-             
-            for lobj in self.lobjs_text_line:
-                if bbox.is_hoverlap(lobj) and bbox.is_voverlap(lobj) and (text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split()))):
-                    return lobj
+        objs = []
+        children = {}
+        lobjs = []
+        for i in range(start, end):
+            kind = self.KINDS[kinds[i]]
+            bbox = tuple(bboxes[4 * i:4 * i + 4])
+            if kind == 'image':
+                lobj = image_object(bbox, *self.images[i])
+            else:
+                lobj = page_object(kind, bbox, bytes(texts[text_starts[i]:text_starts[i + 1]]).decode('utf-8'))
+            lobjs.append(lobj)
+            parent = parents[i]
+            if parent < 0:
+                objs.append(lobj)
+            else:
+                children.setdefault(parent, []).append(lobj)
                 
-    def find_text_line_all(self, text = '', constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+        for parent, lchildren in children.items():
+            lobj = lobjs[parent - start]
+            lobj.children = tuple(lchildren)
+            # Text of a text box with text lines is joined from its lines, as in compact_layout.
+            if lobj.kind == 'text_box' and lchildren[0].kind == 'text_line':
+                lobj.text = None
+                
+        x0, y0, x1, y1 = self.page_bboxes[4 * p:4 * p + 4]
+        return page_layout(self.pageids[p], (x0, y0, x1, y1), self.page_rotates[p], tuple(objs))
+    
+    @classmethod
+    def write(cls, dest, pages, no_pages, keep_chars = False):
         """
-        Find all text_line containing  particular string within constraints.
+        Write page layouts in the layout_store format.
         
         Args:
-            text (str): text to searched
-            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
-            mybox (box): box object for searching within a particular box
-            myrow (row): row object to constrain the search to a particular row
-            mycolumn (column): column object to constrain the search to a particular column
+            dest (str or file): path of the file, or writable binary file object
+            pages (list): (page number, page_layout object) tuples of the pages
+            no_pages (int): number of pages of the document, including pages not stored
+            keep_chars (bool): whether the layouts keep characters of text lines
+        """
+        
+        columns = dict((name, array.array(typecode)) for name, typecode, _, _, _ in cls.COLUMNS)
+        codes = dict((kind, code) for code, kind in enumerate(cls.KINDS))
+        texts = []
+        text_size = 0
+        images = {}
+        pageids = []
+        
+        columns['page_starts'].append(0)
+        columns['text_starts'].append(0)
+        nobjs = 0
+        for pageno, layout in pages:
+            columns['page_numbers'].append(pageno)
+            columns['page_bboxes'].extend(layout.bbox)
+            columns['page_rotates'].append(int(layout.rotate))
+            pageids.append(layout.pageid)
+            
+            # Objects are stored in pre-order, each with the index of its parent.
+            stack = [(lobj, -1) for lobj in reversed(layout.objs)]
+            while stack:
+                lobj, parent = stack.pop()
+                index = nobjs
+                nobjs += 1
+                columns['kinds'].append(codes[lobj.kind])
+                columns['parents'].append(parent)
+                columns['bboxes'].extend(lobj.bbox)
+                if isinstance(lobj, image_object):
+                    images[index] = (lobj.name, lobj.srcsize, lobj.bits, lobj.colorspace, lobj.mode, lobj.filters, lobj.objid, lobj.data)
+                else:
+                    text = (lobj.text or '').encode('utf-8')
+                    texts.append(text)
+                    text_size += len(text)
+                columns['text_starts'].append(text_size)
+                stack.extend((child, index) for child in reversed(lobj.children))
+            columns['page_starts'].append(nobjs)
+            
+        extra = marshal.dumps({'no_pages': no_pages, 'keep_chars': keep_chars, 'pageids': pageids, 'images': images})
+        
+        chunks = [cls.HEADER.pack(cls.MAGIC, len(pageids), nobjs, text_size, len(extra))]
+        for name, _, _, _, _ in cls.COLUMNS:
+            column = columns[name]
+            if sys.byteorder != 'little':
+                column.byteswap()
+            chunks.append(column.tobytes())
+            chunks.append(b'\x00' * (-len(chunks[-1]) % 8))
+        chunks.extend(texts)
+        chunks.append(b'\x00' * (-text_size % 8))
+        chunks.append(extra)
+        
+        if hasattr(dest, 'write'):
+            for chunk in chunks:
+                dest.write(chunk)
+        else:
+            fd, tmp_path = tempfile.mkstemp(dir = os.path.dirname(os.path.abspath(dest)), suffix = '.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmp_path, dest)
+            
+# End of a revision of a pdf file, an incremental update appends another one.
+REVISION_END = re.compile(rb'%%EOF(?:\r\n|\r|\n)?')
+EOF_MARKER = re.compile(rb'%%EOF')
+
+# Page attributes layout analysis depends on, inherited ones included.
+LAYOUT_ATTRS = ('Contents', 'Resources', 'MediaBox', 'CropBox', 'Rotate')
+
+def find_revisions(data):
+    """
+    Find revisions of a pdf file from its end-of-file markers, each incremental update appending a revision.
+    An end-of-line after a marker is counted in the revision before it, though the revision may have ended without it,
+    the update starting with the end-of-line, see hash_revisions.
+    
+    Args:
+        data (bytes): content of the pdf file
+        
+    Returns:
+        list of sizes in bytes of the revisions, the last one being the whole file
+    """
+    
+    ends = [match.end() for match in REVISION_END.finditer(data)]
+    if not ends or ends[-1] < len(data):
+        ends.append(len(data))
+    return ends
+
+def hash_revisions(chunks):
+    """
+    Hash the content of a pdf file and, in the same pass, every prefix of it which may be an earlier revision.
+    An earlier revision ends at an end-of-file marker, with or without an end-of-line after it, as the update may start with the end-of-line,
+    so the prefixes ending at the marker and one or two bytes after it are all hashed.
+    
+    Args:
+        chunks (iterable): bytes-like chunks of the content of the pdf file, in order
+        
+    Returns:
+        tuple of sha256 hex-digest of the content, and list of (size, sha256 hex-digest) tuples of the prefixes ending before the last marker
+    """
+    
+    digest = hashlib.sha256()
+    prefixes = []
+    pending = []
+    last_end = None
+    pos = 0
+    tail = b''
+    overlap = len(EOF_MARKER.pattern) - 1
+    for chunk in chunks:
+        # Markers split between two chunks start in the tail of the previous chunk.
+        joined = tail + bytes(chunk[:overlap])
+        ends = [pos - len(tail) + match.end() for match in EOF_MARKER.finditer(joined) if match.start() < len(tail)]
+        ends.extend(pos + match.end() for match in EOF_MARKER.finditer(chunk))
+        for end in ends:
+            pending.extend((end, end + 1, end + 2))
+            last_end = end
+            
+        start = 0
+        while pending and pending[0] <= pos + len(chunk):
+            end = pending.pop(0)
+            digest.update(chunk[start:end - pos])
+            start = end - pos
+            prefixes.append((end, digest.hexdigest()))
+        digest.update(chunk[start:])
+        pos += len(chunk)
+        tail = (tail + bytes(chunk[-overlap:]))[-overlap:]
+        
+    return digest.hexdigest(), [(end, hexdigest) for end, hexdigest in prefixes if end < last_end]
+
+def _xref_entries(doc):
+    """Returns dict of object id to (id of object stream holding it or None, file position or index in that stream), from the newest xref section defining it."""
+    
+    entries = {}
+    for xref in doc.xrefs:
+        for objid in xref.get_objids():
+            if objid in entries:
+                continue
+            try:
+                strmid, index, _ = xref.get_pos(objid)
+            except KeyError:
+                continue
+            entries[objid] = (strmid, index)
+    return entries
+
+def updated_objids(entries, boundary):
+    """Returns set of ids of the objects defined after the boundary offset, in the xref entries made by _xref_entries."""
+    
+    updated = set()
+    for objid, (strmid, index) in entries.items():
+        if strmid is not None:
+            index = entries.get(strmid, (None, -1))[1]
+        if index >= boundary:
+            updated.add(objid)
+    return updated
+
+def _same_value(a, b):
+    """Check whether two direct pdf values are equal, indirect objects being equal if they have the same object id."""
+    
+    if isinstance(a, PDFObjRef) or isinstance(b, PDFObjRef):
+        return isinstance(a, PDFObjRef) and isinstance(b, PDFObjRef) and a.objid == b.objid
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_same_value(a[key], b[key]) for key in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_same_value(x, y) for x, y in zip(a, b))
+    if isinstance(a, PDFStream) or isinstance(b, PDFStream):
+        return a is b
+    return type(a) == type(b) and a == b
+
+def _reaches(roots, updated, entries, clean):
+    """
+    Check whether any updated object is reachable from the roots without following /Parent links.
+    Objects found not to reach an updated object are added to the clean set, which later walks skip.
+    """
+    
+    visited = set()
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, PDFObjRef):
+            if obj.objid in updated:
+                return True
+            if obj.objid in clean or obj.objid in visited:
+                continue
+            visited.add(obj.objid)
+            # Objects stored directly in the file, as image streams, are read without being cached, objects of object streams are cached with their stream.
+            if entries.get(obj.objid, (None, 0))[0] is None:
+                obj = _resolve_uncached(obj)
+            else:
+                obj = resolve1(obj)
+                
+        if isinstance(obj, PDFStream):
+            obj = obj.attrs
+        if isinstance(obj, dict):
+            stack.extend(value for key, value in obj.items() if key != 'Parent')
+        elif isinstance(obj, list):
+            stack.extend(obj)
+            
+    clean.update(visited)
+    return False
+
+def unchanged_pages(pages, old_pages, boundary):
+    """
+    Find pages of a pdf document whose layout is the same as in an earlier revision of it.
+    A page is unchanged if it existed in the earlier revision with the same layout attributes and no object defined
+    after that revision is reachable from them, so changes of annotations or form fields do not count.
+    
+    Args:
+        pages (list): PDFPage objects of the document
+        old_pages (list): PDFPage objects of the earlier revision
+        boundary (int): size in bytes of the earlier revision
+        
+    Returns:
+        dict of page number to page number in the earlier revision of the unchanged pages
+    """
+    
+    if not pages:
+        return {}
+    
+    entries = _xref_entries(pages[0].doc)
+    updated = updated_objids(entries, boundary)
+    old_pagenos = dict((page.pageid, pageno) for pageno, page in enumerate(old_pages))
+    
+    clean = set()
+    unchanged = {}
+    for pageno, page in enumerate(pages):
+        old_pageno = old_pagenos.get(page.pageid)
+        if old_pageno is None:
+            continue
+        old_page = old_pages[old_pageno]
+        if not all(_same_value(page.attrs.get(key), old_page.attrs.get(key)) for key in LAYOUT_ATTRS):
+            continue
+        if _reaches([page.attrs.get(key) for key in LAYOUT_ATTRS], updated, entries, clean):
+            continue
+        unchanged[pageno] = old_pageno
+    return unchanged
+
+# Layout analysis profiles of pdf_parser, functions returning LAParams object or None to skip layout analysis.
+LAPARAMS_PROFILES = {
+    # pdfminer defaults, text boxes are ordered by hierarchical grouping.
+    'default': lambda: LAParams(),
+    # Also analyzes vertical text and text inside figures.
+    'full': lambda: LAParams(detect_vertical = True, all_texts = True),
+    # Skips the hierarchical grouping of text boxes, which dominates layout analysis of pages with many text boxes, text boxes are ordered top to bottom.
+    'fast': lambda: LAParams(detect_vertical = False, all_texts = False, boxes_flow = None),
+    # No grouping of characters into text lines and boxes, page_parser gets raw characters in lobjs_char besides rects, lines and figures, text finders raise ValueError.
+    'geometry': lambda: None,
+}
+
+def get_laparams(profile):
+    """
+    Get LAParams object of a layout analysis profile.
+    
+    Args:
+        profile (str or LAParams): name from LAPARAMS_PROFILES, LAParams object returned as is, or None for no layout analysis
+        
+    Returns:
+        LAParams object, else None if layout analysis is skipped
+    """
+    
+    if profile is None or isinstance(profile, LAParams):
+        return profile
+    if profile not in LAPARAMS_PROFILES:
+        raise ValueError('Unknown layout analysis profile %r, value from %r' % (profile, sorted(LAPARAMS_PROFILES)))
+    return LAPARAMS_PROFILES[profile]()
+
+class null_instrument():
+    """Default instrument of pdf_parser and page_parser, records nothing, timing is skipped entirely when enabled is False."""
+    
+    enabled = False
+    
+    def record(self, stage, pageno, seconds, count = None):
+        pass
+    
+NULL_INSTRUMENT = null_instrument()
+
+class stage_metrics():
+    """
+    Instrument recording duration and object count of each stage of parsing, per page.
+    
+    Stages are 'open' (walking the page tree), 'pdf_reader' (creating the PyPDF2 reader), 'cache_load', 'interpret' (pdfminer
+    interpretation of the content stream), 'layout' (pdfminer layout analysis), 'compact', 'parallel' (analysis of all pages in
+    worker processes), 'classify' (page_parser sorting objects into lists), 'figure_text' (text boxes inside figures),
+    'find' (a single find* query, timed until its results are consumed), 'extract' (page_parser.extract of a template), 'page_stream', 'ocr' (ocr_pages of the whole document)
+    and 'revision' (finding pages unchanged since an earlier revision).
+    """
+    
+    enabled = True
+    
+    def __init__(self, callback = None):
+        """
+        Args:
+            callback (callable): if given, called as callback(stage, pageno, seconds, count) for every record, e.g. to export to monitoring
+        """
+        
+        self.callback = callback
+        self.records = []
+        
+    def record(self, stage, pageno, seconds, count = None):
+        """Records a stage of a page, pageno is None for stages of the whole document, count is the number of objects handled if known."""
+        
+        self.records.append((stage, pageno, seconds, count))
+        if self.callback is not None:
+            self.callback(stage, pageno, seconds, count)
+            
+    def summary(self):
+        """
+        Get totals of every stage.
+        
+        Returns:
+            dict of stage to dict with 'calls', 'seconds' and 'count' totals
+        """
+        
+        totals = {}
+        for stage, pageno, seconds, count in self.records:
+            total = totals.setdefault(stage, {'calls': 0, 'seconds': 0.0, 'count': 0})
+            total['calls'] += 1
+            total['seconds'] += seconds
+            total['count'] += count or 0
+        return totals
+    
+    def clear(self):
+        self.records = []
+        
+class _timed_aggregator(PDFPageAggregator):
+    """PDFPageAggregator measuring layout analysis separately from interpretation, used only with an enabled instrument."""
+    
+    layout_seconds = 0.0
+    
+    def end_page(self, page):
+        start = time.perf_counter()
+        PDFPageAggregator.end_page(self, page)
+        self.layout_seconds = time.perf_counter() - start
+        
+_worker_state = {}
+
+def _init_page_worker(source, laparams, keep_chars):
+    """Initializer of page worker processes, parses the pdf document, given as path or bytes, once per process."""
+    
+    fp, _worker_state['opened'] = open_pdf_source(source)
+    rsrcmgr = PDFResourceManager()
+    device = PDFPageAggregator(rsrcmgr, laparams=laparams)
+    _worker_state['interpreter'] = _image_interpreter(rsrcmgr, device)
+    _worker_state['device'] = device
+    _worker_state['keep_chars'] = keep_chars
+    _worker_state['text_analysis'] = laparams is not None
+    _worker_state['pages'] = list(PDFPage.get_pages(fp))
+    
+def _analyze_page_slice(pagenos):
+    """Runs layout analysis of given pages in a page worker process and returns their page_layout objects."""
+    
+    interpreter = _worker_state['interpreter']
+    device = _worker_state['device']
+    pages = _worker_state['pages']
+    
+    layouts = []
+    for pageno in pagenos:
+        interpreter.process_page(pages[pageno])
+        layouts.append(compact_layout(device.get_result(), _worker_state['keep_chars'], _worker_state['text_analysis']))
+        _release_contents(pages[pageno])
+    return layouts
+    
+class axis_index():
+    """Uniform grid of cells along one axis, mapping each cell to indices of the spans overlapping it."""
+    
+    # Spans covering more than this fraction of the axis are kept aside and always returned as candidates.
+    WIDE_FRACTION = 0.25
+    
+    def __init__(self, spans):
+        """
+        Args:
+            spans (list): list of (start, end) tuples along the axis
+        """
+        
+        self.wide = []
+        self.cells = []
+        if not spans:
+            return
+        
+        self.lo = min(start for start, _ in spans)
+        self.hi = max(end for _, end in spans)
+        ncells = max(1, min(len(spans), 1024))
+        self.cell_size = float(self.hi - self.lo) / ncells or 1.0
+        self.cells = [[] for _ in range(ncells)]
+        
+        max_cells = max(1, int(ncells * self.WIDE_FRACTION))
+        for i, (start, end) in enumerate(spans):
+            c0 = self._cell(start)
+            c1 = self._cell(end)
+            if c1 - c0 >= max_cells:
+                self.wide.append(i)
+            else:
+                for c in range(c0, c1 + 1):
+                    self.cells[c].append(i)
+                    
+    def _cell(self, value):
+        c = int((value - self.lo) / self.cell_size)
+        return min(max(c, 0), len(self.cells) - 1)
+    
+    def candidates(self, start, end):
+        """Returns sorted indices of spans which may overlap the range start to end."""
+        
+        if not self.cells:
+            return []
+        
+        start, end = min(start, end), max(start, end)
+        if end < self.lo or start > self.hi:
+            return []
+        
+        found = set(self.wide)
+        for c in range(self._cell(start), self._cell(end) + 1):
+            found.update(self.cells[c])
+        return sorted(found)
+    
+class grid_index():
+    """Spatial index over bounding boxes of a list of layout objects, for row, column and box constrained lookups."""
+    
+    def __init__(self, lobjs):
+        self.lobjs = lobjs
+        self.xs = axis_index([(lobj.x0, lobj.x1) for lobj in lobjs])
+        self.ys = axis_index([(lobj.y0, lobj.y1) for lobj in lobjs])
+        
+    def query_row(self, y0, y1):
+        """Returns indices of objects, in order, vertically overlapping the row from y0 to y1."""
+        
+        lobjs = self.lobjs
+        return [i for i in self.ys.candidates(y0, y1) if lobjs[i].y0 <= y1 and y0 <= lobjs[i].y1]
+    
+    def query_column(self, x0, x1):
+        """Returns indices of objects, in order, horizontally overlapping the column from x0 to x1."""
+        
+        lobjs = self.lobjs
+        return [i for i in self.xs.candidates(x0, x1) if lobjs[i].x0 <= x1 and x0 <= lobjs[i].x1]
+    
+    def query_box(self, x0, y0, x1, y1):
+        """Returns indices of objects, in order, overlapping the box bound by x0, y0, x1 and y1."""
+        
+        lobjs = self.lobjs
+        return [i for i in self.ys.candidates(y0, y1) if lobjs[i].y0 <= y1 and y0 <= lobjs[i].y1 and lobjs[i].x0 <= x1 and x0 <= lobjs[i].x1]
+    
+REGEX_METACHARS = frozenset('.^$*+?{}[]\\|()')
+
+@functools.lru_cache(maxsize = 1024)
+def get_text_matcher(text, match = 'auto'):
+    """
+    Returns a function testing whether a normalized text matches the searched text, cached across calls.
+    
+    Args:
+        text (str): text to searched, matched case-insensitively
+        match (str): 'literal' for substring match, 'regex' for regular expression search, 'auto' for either
+        
+    Returns:
+        function taking a normalized text and returning True if it matches
+    """
+    
+    text = text.lower()
+    if match == 'literal' or (match == 'auto' and REGEX_METACHARS.isdisjoint(text)):
+        return lambda normalized: text in normalized
+    
+    if match == 'regex':
+        return re.compile(text).search
+    
+    if match != 'auto':
+        raise ValueError("match must be one of 'auto', 'literal' or 'regex'")
+    
+    try:
+        search = re.compile(text).search
+    except re.error:
+        return lambda normalized: text in normalized
+    return lambda normalized: text in normalized or search(normalized) is not None
+
+def normalize_text(text):
+    """Returns lower-cased text with runs of whitespace collapsed into single spaces, as matched by find methods."""
+    
+    return " ".join(text.lower().split())
+
+class bbox_store():
+    """Columnar NumPy arrays of bounding boxes and kind codes of all objects of a page, for vectorized geometric queries."""
+    
+    KINDS = ('text', 'text_line', 'rect', 'line', 'fig', 'img', 'char')
+    
+    # Upper bound on the size of the boxes x objects matrices built by query_boxes.
+    MAX_BLOCK = 1 << 22
+    
+    def __init__(self, page):
+        """
+        Args:
+            page (page_parser): page whose lobjs_text, lobjs_text_line, lobjs_rect, lobjs_line, lobjs_fig, lobjs_img and lobjs_char are stored
+        """
+        
+        if np is None:
+            raise ImportError('numpy is required for bbox_store')
+        
+        bboxes = []
+        kinds = []
+        self.slices = {}
+        for code, kind in enumerate(self.KINDS):
+            lobjs = getattr(page, 'lobjs_' + kind)
+            self.slices[kind] = (len(bboxes), len(bboxes) + len(lobjs))
+            bboxes.extend(lobj.bbox for lobj in lobjs)
+            kinds.extend([code] * len(lobjs))
+            
+        self.bboxes = np.array(bboxes, dtype = np.float64).reshape(-1, 4)
+        self.kinds = np.array(kinds, dtype = np.int8)
+        
+    def get_bboxes(self, kind):
+        """Returns (n, 4) array of x0, y0, x1, y1 of the objects of a kind, in order of the page_parser list."""
+        
+        start, stop = self.slices[kind]
+        return self.bboxes[start:stop]
+    
+    def mask(self, kind, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+        """
+        Get boolean mask of the objects of a kind lying within constraints.
+        
+        Args:
+            kind (str): kind of objects, value from ['text', 'text_line', 'rect', 'line', 'fig', 'img', 'char']
+            constraint (str): constraint to be applied, value from ['row', 'column', 'box']
+            mybox (box): box object for searching within a particular box
+            myrow (row): row object to constrain the search to a particular row
+            mycolumn (column): column object to constrain the search to a particular column
+            
+        Returns:
+            boolean array over the objects of that kind
+        """
+        
+        x0, y0, x1, y1 = self.get_bboxes(kind).T
+        if constraint == None:
+            return np.ones(len(x0), dtype = bool)
+        
+        if constraint == 'box' and mybox != None:
+            myrow = mybox.myrow
+            mycolumn = mybox.mycolumn
+            
+        if constraint == 'row':
+            return (y0 <= myrow.y1) & (myrow.y0 <= y1)
+        elif constraint == 'column':
+            return (x0 <= mycolumn.x1) & (mycolumn.x0 <= x1)
+        elif constraint == 'box':
+            return (y0 <= myrow.y1) & (myrow.y0 <= y1) & (x0 <= mycolumn.x1) & (mycolumn.x0 <= x1)
+        return np.zeros(len(x0), dtype = bool)
+    
+    def query(self, kind, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+        """Returns array of indices of the objects of a kind lying within constraints, arguments as in mask."""
+        
+        return np.flatnonzero(self.mask(kind, constraint, mybox, myrow, mycolumn))
+    
+    def query_boxes(self, kind, boxes):
+        """
+        Find the objects of a kind overlapping each of many boxes at once.
+        
+        Args:
+            kind (str): kind of objects, value from ['text', 'text_line', 'rect', 'line', 'fig', 'img', 'char']
+            boxes (list): box objects
+            
+        Returns:
+            list with an array of indices of the overlapping objects for each box
+        """
+        
+        x0, y0, x1, y1 = self.get_bboxes(kind).T
+        queries = np.array([(b.mycolumn.x0, b.myrow.y0, b.mycolumn.x1, b.myrow.y1) for b in boxes], dtype = np.float64).reshape(-1, 4)
+        
+        found = []
+        step = max(1, self.MAX_BLOCK // max(1, len(x0)))
+        for start in range(0, len(queries), step):
+            block = queries[start:start + step]
+            qx0, qy0, qx1, qy1 = (column[:, None] for column in block.T)
+            rows, cols = np.nonzero((y0 <= qy1) & (qy0 <= y1) & (x0 <= qx1) & (qx0 <= x1))
+            found.extend(np.split(cols, np.searchsorted(rows, np.arange(1, len(block)))))
+        return found
+    
+class table():
+    """Table found on a page, with the x-coordinates of its column boundaries, y-coordinates of its row boundaries and text lines of its cells."""
+    
+    __slots__ = ('x0', 'y0', 'x1', 'y1', 'xs', 'ys', 'cells')
+    
+    def __init__(self, xs, ys, cells):
+        """
+        Args:
+            xs (list): x-coordinates of the column boundaries, left to right
+            ys (list): y-coordinates of the row boundaries, top to bottom
+            cells (list): rows top to bottom of cells left to right, each cell a list of its text lines
+        """
+        
+        self.xs = xs
+        self.ys = ys
+        self.cells = cells
+        (self.x0, self.y0, self.x1, self.y1) = (xs[0], ys[-1], xs[-1], ys[0])
+        
+    def __repr__(self):
+        return '<table %.3f,%.3f,%.3f,%.3f %dx%d>' % (self.x0, self.y0, self.x1, self.y1, self.get_no_rows(), self.get_no_columns())
+    
+    @property
+    def bbox(self):
+        return (self.x0, self.y0, self.x1, self.y1)
+    
+    def get_no_rows(self):
+        return len(self.ys) - 1
+    
+    def get_no_columns(self):
+        return len(self.xs) - 1
+    
+    def get_cell_box(self, i, j):
+        """Get box object of the cell in row i and column j."""
+        
+        return box(row(self.ys[i + 1], self.ys[i]), column(self.xs[j], self.xs[j + 1]))
+    
+    def get_rows(self):
+        """
+        Get text of the table as rows.
+        
+        Returns:
+            list of rows top to bottom, each a list of the texts of its cells left to right, text lines of a cell joined by newlines
+        """
+        
+        return [['\n'.join(lobj.get_text().strip() for lobj in cell) for cell in cells] for cells in self.cells]
+    
+    def get_columns(self):
+        """Get text of the table as columns, each a list of the texts of its cells top to bottom."""
+        
+        return [list(column) for column in zip(*self.get_rows())]
+    
+    def to_array(self):
+        """Get text of the table as NumPy array of shape (rows, columns) and object dtype, requires numpy."""
+        
+        if np is None:
+            raise ImportError('numpy is required for table.to_array')
+        
+        array = np.empty((self.get_no_rows(), self.get_no_columns()), dtype = object)
+        array[:, :] = self.get_rows()
+        return array
+    
+def _table_edges(lobjs, snap):
+    """Returns horizontal and vertical edges, as page_object lines, of the rects and lines, a rect thinner than snap being a single ruling edge."""
+    
+    horizontal = []
+    vertical = []
+    for lobj in lobjs:
+        x0, y0, x1, y1 = lobj.bbox
+        if y1 - y0 <= snap:
+            if x1 - x0 > snap:
+                y = (y0 + y1) / 2.0
+                horizontal.append(page_object('line', (x0, y, x1, y)))
+        elif x1 - x0 <= snap:
+            x = (x0 + x1) / 2.0
+            vertical.append(page_object('line', (x, y0, x, y1)))
+        elif not isinstance(lobj, LTLine) and getattr(lobj, 'kind', None) != 'line':
+            horizontal.append(page_object('line', (x0, y0, x1, y0)))
+            horizontal.append(page_object('line', (x0, y1, x1, y1)))
+            vertical.append(page_object('line', (x0, y0, x0, y1)))
+            vertical.append(page_object('line', (x1, y0, x1, y1)))
+    return horizontal, vertical
+
+def _group_edges(edges, snap):
+    """Returns lists of edges, each list the edges connected to each other within snap, with help of a grid_index."""
+    
+    grid = grid_index(edges)
+    parents = list(range(len(edges)))
+    
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+    
+    for i, edge in enumerate(edges):
+        for j in grid.query_box(edge.x0 - snap, edge.y0 - snap, edge.x1 + snap, edge.y1 + snap):
+            if j > i:
+                parents[find(j)] = find(i)
+                
+    groups = {}
+    for i, edge in enumerate(edges):
+        groups.setdefault(find(i), []).append(edge)
+    return list(groups.values())
+
+def _grid_lines(spans, lo, hi, snap, min_coverage):
+    """
+    Returns sorted positions of grid lines from (position, start, end) spans of edges along one axis.
+    Positions within snap are merged, a grid line is kept if its spans cover at least min_coverage of the extent lo to hi.
+    """
+    
+    lines = []
+    spans.sort()
+    i = 0
+    while i < len(spans):
+        j = i + 1
+        while j < len(spans) and spans[j][0] - spans[j - 1][0] <= snap:
+            j += 1
+        
+        covered = 0.0
+        end = None
+        for _, s0, s1 in sorted(spans[i:j], key = lambda span: span[1]):
+            if end is None or s0 > end + snap:
+                covered += s1 - s0
+                end = s1
+            elif s1 > end:
+                covered += s1 - end
+                end = s1
+        if covered >= min_coverage * (hi - lo):
+            lines.append(sum(span[0] for span in spans[i:j]) / (j - i))
+        i = j
+    return lines
+
+def _collapse_lines(lines, centers, min_size):
+    """Drops grid lines closer than min_size to the previous kept line with no text center between them, keeping the outer boundaries."""
+    
+    kept = lines[:1]
+    for k, line in enumerate(lines[1:], 1):
+        if line - kept[-1] < min_size and bisect.bisect_right(centers, kept[-1]) == bisect.bisect_left(centers, line):
+            if k == len(lines) - 1 and len(kept) > 1:
+                kept[-1] = line
+            continue
+        kept.append(line)
+    return kept
+
+def find_tables(page, snap = 2.0, min_coverage = 0.5, min_size = 8.0):
+    """
+    Find tables of a page from its ruling lines and rects, and assign its text lines to their cells.
+    
+    Args:
+        page (page_parser): page to search in
+        snap (float): rects and lines thinner than this are ruling lines, and edges closer than this are joined
+        min_coverage (float): fraction of the width or height of a table a row or column boundary must cover
+        min_size (float): empty rows and columns narrower than this, as the padding of shaded cells, are merged into their neighbour
+        
+    Returns:
+        list of table objects, top to bottom
+    """
+    
+    horizontal, vertical = _table_edges(page.lobjs_rect + page.lobjs_line, snap)
+    if not horizontal or not vertical:
+        return []
+    
+    text_grid = page._grids.get('lobjs_text_line')
+    if text_grid is None:
+        text_grid = page._grids['lobjs_text_line'] = grid_index(page.lobjs_text_line)
+        
+    tables = []
+    for edges in _group_edges(horizontal + vertical, snap):
+        x0 = min(edge.x0 for edge in edges)
+        y0 = min(edge.y0 for edge in edges)
+        x1 = max(edge.x1 for edge in edges)
+        y1 = max(edge.y1 for edge in edges)
+        if x1 - x0 < min_size or y1 - y0 < min_size:
+            continue
+        
+        ys = _grid_lines([(e.y0, e.x0, e.x1) for e in edges if e.y0 == e.y1 and e.x0 != e.x1], x0, x1, snap, min_coverage)
+        xs = _grid_lines([(e.x0, e.y0, e.y1) for e in edges if e.x0 == e.x1], y0, y1, snap, min_coverage)
+        if len(xs) < 2 or len(ys) < 2:
+            continue
+        
+        lines = []
+        for i in text_grid.query_box(xs[0], ys[0], xs[-1], ys[-1]):
+            lobj = page.lobjs_text_line[i]
+            cx = (lobj.x0 + lobj.x1) / 2.0
+            cy = (lobj.y0 + lobj.y1) / 2.0
+            if xs[0] < cx < xs[-1] and ys[0] < cy < ys[-1]:
+                lines.append((cx, cy, lobj))
+                
+        xs = _collapse_lines(xs, sorted(cx for cx, _, _ in lines), min_size)
+        ys = _collapse_lines(ys, sorted(cy for _, cy, _ in lines), min_size)
+        if (len(xs) - 1) * (len(ys) - 1) < 2:
+            continue
+        
+        # Rows are numbered top to bottom, text lines of a cell are kept in reading order.
+        nrows = len(ys) - 1
+        cells = [[[] for _ in range(len(xs) - 1)] for _ in range(nrows)]
+        for cx, cy, lobj in sorted(lines, key = lambda line: (-line[2].y1, line[2].x0)):
+            i = nrows - bisect.bisect_left(ys, cy)
+            j = bisect.bisect_left(xs, cx) - 1
+            cells[i][j].append(lobj)
+            
+        tables.append(table(xs, ys[::-1], cells))
+        
+    tables.sort(key = lambda t: (-t.y1, t.x0))
+    return tables
+
+class ocr_image():
+    """Picklable image of a page passed to an OCR backend, with its data encoded as 'jpeg' or 'jp2' format, or 'raw' samples of the mode."""
+    
+    __slots__ = ('data', 'format', 'width', 'height', 'mode')
+    
+    def __init__(self, data, format, width, height, mode = None):
+        self.data = data
+        self.format = format
+        self.width = width
+        self.height = height
+        self.mode = mode
+        
+    @classmethod
+    def from_lt_image(cls, lt_image):
+        """Get ocr_image of a LTImage object, else None if its filter or color space is not supported."""
+        
+        return cls.from_stream(lt_image.stream)
+    
+    @classmethod
+    def from_stream(cls, stream):
+        """Get ocr_image of an image stream, else None if its filter or color space is not supported."""
+        
+        filters = [f.name for f, _ in stream.get_filters() if isinstance(f, PSLiteral)]
+        width, height = resolve1(stream.get('Width')), resolve1(stream.get('Height'))
+        format = _image_format(filters)
+        if format in ('jpeg', 'jp2'):
+            return cls(stream.get_data(), format, width, height)
+        if format != 'raw' or 'CCITTFaxDecode' in filters:
+            return None
+        
+        mode = _image_mode(stream.get_any(('CS', 'ColorSpace')), resolve1(stream.get_any(('BPC', 'BitsPerComponent'))))
+        if mode is None:
+            return None
+        data = _apply_decode(stream.get_data(), stream.get_any(('D', 'Decode')), len(mode) if mode != '1' else 1)
+        if data is None:
+            return None
+        return cls(data, 'raw', width, height, mode)
+    
+    def to_pil(self):
+        """Get Pillow image of the image, requires Pillow."""
+        
+        if pil_image is None:
+            raise ImportError('Pillow is required for ocr_image.to_pil')
+        
+        if self.format == 'raw':
+            return pil_image.frombytes(self.mode, (self.width, self.height), self.data)
+        return pil_image.open(io.BytesIO(self.data))
+    
+class tesseract_ocr():
+    """
+    OCR backend running local Tesseract through pytesseract, requires pytesseract and Pillow.
+    
+    An OCR backend is any picklable callable taking an ocr_image and returning its text as list of blocks, each a list of lines,
+    each a list of (text, left, top, right, bottom) words in pixels from the top-left corner of the image.
+    """
+    
+    def __init__(self, lang = 'eng', config = '', min_confidence = 0):
+        """
+        Args:
+            lang (str): Tesseract language(s) of the text
+            config (str): additional Tesseract options
+            min_confidence (float): words recognized with a lower confidence are dropped
+        """
+        
+        self.lang = lang
+        self.config = config
+        self.min_confidence = min_confidence
+        
+    def __call__(self, image):
+        if pytesseract is None:
+            raise ImportError('pytesseract is required for tesseract_ocr')
+        
+        data = pytesseract.image_to_data(image.to_pil(), lang = self.lang, config = self.config, output_type = pytesseract.Output.DICT)
+        
+        # Words are grouped by paragraph into blocks and by line into lines, in the order Tesseract reads them.
+        blocks = {}
+        for i, text in enumerate(data['text']):
+            if not text.strip() or float(data['conf'][i]) < self.min_confidence:
+                continue
+            left, top = data['left'][i], data['top'][i]
+            lines = blocks.setdefault((data['block_num'][i], data['par_num'][i]), {})
+            lines.setdefault(data['line_num'][i], []).append((text, left, top, left + data['width'][i], top + data['height'][i]))
+        return [list(lines.values()) for lines in blocks.values()]
+    
+def is_image_only_page(pdf_page):
+    """
+    Check from the resources of a page, without interpreting its content, whether it draws images but no text, as a scanned page.
+    Resources of form XObjects used by the page are checked as well.
+    
+    Args:
+        pdf_page (PDFPage): page of the pdf document from pdfminer
+        
+    Returns:
+        True if the page has no fonts and at least one image, else False
+    """
+    
+    has_image = False
+    seen = set()
+    stack = [pdf_page.resources]
+    while stack:
+        resources = resolve1(stack.pop()) or {}
+        if resolve1(resources.get('Font')):
+            return False
+        
+        for ref in (resolve1(resources.get('XObject')) or {}).values():
+            if isinstance(ref, PDFObjRef):
+                if ref.objid in seen:
+                    continue
+                seen.add(ref.objid)
+            xobj = resolve1(ref)
+            if not isinstance(xobj, PDFStream):
+                continue
+            subtype = resolve1(xobj.get('Subtype'))
+            if subtype is LITERAL_IMAGE:
+                has_image = True
+            elif subtype is LITERAL_FORM and 'Resources' in xobj:
+                stack.append(xobj['Resources'])
+    return has_image
+
+def get_lt_images(lobjs):
+    """
+    Get images of a page, descending into figures nested to any depth, as form XObjects using form XObjects,
+    so that the images found are those is_image_only_page finds in the resources.
+    
+    Args:
+        lobjs (list): LT objects of a page
+        
+    Returns:
+        list of LTImage objects, in order
+    """
+    
+    images = []
+    stack = [iter(lobjs)]
+    while stack:
+        for lobj in stack[-1]:
+            if isinstance(lobj, LTImage):
+                images.append(lobj)
+            elif isinstance(lobj, LTFigure):
+                stack.append(iter(lobj))
+                break
+        else:
+            stack.pop()
+    return images
+
+def ocr_text_boxes(blocks, bbox, size):
+    """
+    Get text boxes of words recognized in an image, placed on the page.
+    
+    Args:
+        blocks (list): blocks of lines of words returned by an OCR backend for the image
+        bbox (tuple): bounding box of the image on the page
+        size (tuple): width and height of the image in pixels
+        
+    Returns:
+        list of page_object text boxes, with text lines as children
+    """
+    
+    x0, y0, x1, y1 = bbox
+    sx = (x1 - x0) / float(size[0])
+    sy = (y1 - y0) / float(size[1])
+    
+    text_boxes = []
+    for block in blocks:
+        lines = []
+        for words in block:
+            if not words:
+                continue
+            text = ' '.join(word[0] for word in words) + '\n'
+            left = min(word[1] for word in words)
+            top = min(word[2] for word in words)
+            right = max(word[3] for word in words)
+            bottom = max(word[4] for word in words)
+            lines.append(page_object('text_line', (x0 + left * sx, y1 - bottom * sy, x0 + right * sx, y1 - top * sy), text))
+        if lines:
+            text_box = page_object('text_box', (min(l.x0 for l in lines), min(l.y0 for l in lines), max(l.x1 for l in lines), max(l.y1 for l in lines)), None, lines)
+            text_boxes.append(text_box)
+    return text_boxes
+
+class field_spec():
+    """
+    Field of an extraction template for page_parser.extract, the first or all objects of a kind containing a text within constraints.
+    A field with an anchor is searched relative to the object found for the anchor field, its row, column or box being the
+    bounding box of that object moved by offset.
+    """
+    
+    __slots__ = ('name', 'kind', 'text', 'constraint', 'mybox', 'myrow', 'mycolumn', 'match', 'anchor', 'offset', 'all')
+    
+    TEXT_KINDS = ('text', 'text_line', 'char')
+    
+    def __init__(self, name, kind = 'text', text = None, constraint = None, mybox = None, myrow = row(), mycolumn = column(), match = 'auto', anchor = None, offset = (0, 0, 0, 0), all = False):
+        """
+        Args:
+            name (str): name of the field in the results
+            kind (str): kind of objects, value from ['text', 'text_line', 'rect', 'line', 'fig', 'img', 'char']
+            text (str): if given, only objects containing the text are matched, for 'text', 'text_line' and 'char' kinds
+            constraint (str): constraint to be applied, value from ['row', 'column', 'box'], defaults to 'box' for a field with an anchor
+            mybox (box): box object for searching within a particular box
+            myrow (row): row object to constrain the search to a particular row
+            mycolumn (column): column object to constrain the search to a particular column
+            match (str): 'auto' to match text as substring or regular expression, 'literal' for substring only, 'regex' for regular expression only
+            anchor (str): name of the field the constraint is relative to, replacing mybox, myrow and mycolumn
+            offset (tuple): (dx0, dy0, dx1, dy1) added to the bounding box of the anchor object
+            all (bool): if True, all matching objects are found instead of the first one
+        """
+        
+        if kind not in bbox_store.KINDS:
+            raise ValueError('Unknown kind %r, value from %r' % (kind, bbox_store.KINDS))
+        if text is not None and kind not in self.TEXT_KINDS:
+            raise ValueError('text can not be matched for kind %r' % kind)
+        if anchor is not None and constraint is None:
+            constraint = 'box'
+        if constraint not in (None, 'row', 'column', 'box'):
+            raise ValueError("Unknown constraint %r, value from ['row', 'column', 'box']" % constraint)
+        
+        self.name = name
+        self.kind = kind
+        self.text = text
+        self.constraint = constraint
+        self.mybox = mybox
+        self.myrow = myrow
+        self.mycolumn = mycolumn
+        self.match = match
+        self.anchor = anchor
+        self.offset = offset
+        self.all = all
+        
+    def __repr__(self):
+        return '<field_spec(%s) %s %r>' % (self.name, self.kind, self.text)
+    
+    def get_bounds(self, anchor = None):
+        """Returns (y0, y1) bounds of the row, else None, and (x0, x1) bounds of the column, else None, of the constraint, relative to the anchor object if given."""
+        
+        myrow = self.myrow
+        mycolumn = self.mycolumn
+        if anchor is not None:
+            dx0, dy0, dx1, dy1 = self.offset
+            myrow = row(anchor.y0 + dy0, anchor.y1 + dy1)
+            mycolumn = column(anchor.x0 + dx0, anchor.x1 + dx1)
+        elif self.constraint == 'box' and self.mybox != None:
+            myrow = self.mybox.myrow
+            mycolumn = self.mybox.mycolumn
+            
+        rows = (myrow.y0, myrow.y1) if self.constraint in ('row', 'box') else None
+        columns = (mycolumn.x0, mycolumn.x1) if self.constraint in ('column', 'box') else None
+        return rows, columns
+    
+class page_parser():
+    """
+    Page_parser class for parsing functionality of a particular page of a pdf file, with help of LTPage object from pdfminer.layout module.
+    """
+    
+    def __init__(self, layout, instrument = None, pageno = None, text_analysis = None):
+        """
+        Takes LTPage object and initializes list of children LT objects from that page.
+        
+        Args:
+            layout (LTPage or page_layout): layout of the page
+            instrument (stage_metrics): if given, classification and find* queries of the page are recorded to it
+            pageno (int): page number passed to the instrument
+            text_analysis (bool): False if characters were not grouped into text boxes, as with the 'geometry' profile,
+                so that text finders raise ValueError unless text boxes are added by OCR, None to tell it from characters lying directly on the page
+        """
+        
+        self.instrument = instrument or NULL_INSTRUMENT
+        self.pageno = pageno
+        timed = self.instrument.enabled
+        if timed:
+            start = time.perf_counter()
+            
+        self.layout = layout
+        self.lobjs_all = list(layout)
+        self.lobjs_text = []
+        self.lobjs_text_line = []
+        self.lobjs_rect = []
+        self.lobjs_line = []
+        self.lobjs_fig = []
+        self.lobjs_img = []
+        # Characters lying directly on the page, only when layout analysis is disabled as with the 'geometry' profile.
+        self.lobjs_char = []
+        
+        # Set by add_text_boxes, text finders work on text added by OCR even without text analysis.
+        self.ocr_text = False
+        
+        # grid_index and normalized texts of an object list, built on the first search in that list.
+        self._grids = {}
+        self._texts = {}
+        self._bbox_store = None
+        
+        if isinstance(layout, page_layout):
+            self._init_compact()
+            self.text_analysis = self._detect_text_analysis() if text_analysis is None else text_analysis
+            if timed:
+                self.instrument.record('classify', pageno, time.perf_counter() - start, len(self.lobjs_all))
+            return
+        
+        for lobj in self.lobjs_all:
+            if isinstance(lobj, LTChar):
+                self.lobjs_char.append(lobj)
+                
+            elif isinstance(lobj, LTText):
+                self.lobjs_text.append(lobj)
+            
+            if isinstance(lobj, LTRect):
+                self.lobjs_rect.append(lobj)
+            
+            elif isinstance(lobj, LTLine):
+                self.lobjs_line.append(lobj)
+
+            elif isinstance(lobj, LTFigure):
+                self.lobjs_fig.append(lobj)
+                
+        self.text_analysis = self._detect_text_analysis() if text_analysis is None else text_analysis
+                
+        for lobj_fig in self.lobjs_fig:
+            for lobj in list(lobj_fig):
+                if isinstance(lobj, LTImage):
+                    self.lobjs_img.append(lobj)
+                    
+        for lobj_text in self.lobjs_text:
+            for lobj in list(lobj_text):
+                if isinstance(lobj, LTTextLine):
+                    self.lobjs_text_line.append(lobj)
+                    
+        if timed:
+            fig_start = time.perf_counter()
+            self.instrument.record('classify', pageno, fig_start - start, len(self.lobjs_all))
+                        
+        # Without text analysis characters in figures are left ungrouped as well, as those lying directly on the page.
+        if self.text_analysis:
+            # Figure text boxes are found in one walk and shared by both lists.
+            fig_texts = get_lt_texts(self.lobjs_fig)
+            self.lobjs_text.extend(fig_texts)
+            self.lobjs_text_line.extend(fig_texts)
+            
+            # Text boxes pdfminer made in figures, with the all_texts LAParams, have text lines of their own.
+            fig_text_boxes = get_lt_text_boxes(self.lobjs_fig)
+            self.lobjs_text.extend(fig_text_boxes)
+            self.lobjs_text_line.extend(line for text_box in fig_text_boxes for line in text_box if isinstance(line, LTTextLine))
+        
+        if timed:
+            self.instrument.record('figure_text', pageno, time.perf_counter() - fig_start, len(self.lobjs_fig))
+        
+    def _detect_text_analysis(self):
+        """Returns False if characters lie directly on the page and no text boxes do, as they were not grouped into text lines, else True."""
+        
+        return bool(self.lobjs_text) or not self.lobjs_char
+    
+    def _init_compact(self):
+        """Initializes list of children objects from a page_layout object."""
+        
+        fig_texts = []
+        fig_text_boxes = []
+        for lobj in self.lobjs_all:
+            if lobj.kind == 'char':
+                self.lobjs_char.append(lobj)
+                
+            elif lobj.kind == 'text_box':
+                self.lobjs_text.append(lobj)
+                self.lobjs_text_line.extend(lobj.children)
+                
+            elif lobj.kind == 'rect':
+                self.lobjs_rect.append(lobj)
+                
+            elif lobj.kind == 'line':
+                self.lobjs_line.append(lobj)
+                
+            elif lobj.kind == 'figure':
+                self.lobjs_fig.append(lobj)
+                for child in lobj.children:
+                    if child.kind == 'image':
+                        self.lobjs_img.append(child)
+                    elif child.children and child.children[0].kind == 'text_line':
+                        fig_text_boxes.append(child)
+                    else:
+                        fig_texts.append(child)
+                        
+        self.lobjs_text.extend(fig_texts)
+        self.lobjs_text_line.extend(fig_texts)
+        self.lobjs_text.extend(fig_text_boxes)
+        for text_box in fig_text_boxes:
+            self.lobjs_text_line.extend(text_box.children)
+        
+    def add_text_boxes(self, text_boxes):
+        """
+        Add text boxes not found by layout analysis, as text recognized by OCR, so that find* queries return them.
+        
+        Args:
+            text_boxes (list): page_object text boxes, with text lines as children
+        """
+        
+        self.ocr_text = True
+        self.lobjs_all.extend(text_boxes)
+        self.lobjs_text.extend(text_boxes)
+        for text_box in text_boxes:
+            self.lobjs_text_line.extend(text_box.children)
+            
+        self._grids.clear()
+        self._texts.clear()
+        self._bbox_store = None
+                    
+    def get_layout(self):
+        return self.layout
+                
+    def _get_texts(self, name):
+        """Returns normalized texts of the named object list, computed once per page."""
+        
+        texts = self._texts.get(name)
+        if texts is None:
+            texts = self._texts[name] = [normalize_text(lobj.get_text()) for lobj in getattr(self, name)]
+        return texts
+    
+    def _check_text_list(self, name):
+        """Raises ValueError for the text object lists of a page whose characters were not grouped into text boxes, unless OCR added some."""
+        
+        if name in ('lobjs_text', 'lobjs_text_line') and not self.text_analysis and not self.ocr_text:
+            raise ValueError('Text boxes are not extracted with the layout analysis profile of the page, use find_char_all or another profile')
+    
+    def _search(self, name, text, constraint, mybox, myrow, mycolumn, match = 'auto'):
+        """Yields objects from the named object list, recording the query to the instrument if it is enabled."""
+        
+        self._check_text_list(name)
+        found = self._scan(name, text, constraint, mybox, myrow, mycolumn, match)
+        if self.instrument.enabled:
+            found = self._timed_search(found)
+        return found
+    
+    def _timed_search(self, found):
+        """Yields from the generator of a query, recording the time spent in it and the number of objects found as 'find' stage."""
+        
+        seconds = 0.0
+        count = 0
+        start = time.perf_counter()
+        try:
+            for lobj in found:
+                seconds += time.perf_counter() - start
+                count += 1
+                yield lobj
+                start = time.perf_counter()
+            seconds += time.perf_counter() - start
+        finally:
+            self.instrument.record('find', self.pageno, seconds, count)
+            
+    def _scan(self, name, text, constraint, mybox, myrow, mycolumn, match = 'auto'):
+        """Yields objects from the named object list, in order, lying within the constraints and containing the text if text is not None."""
+        
+        lobjs = getattr(self, name)
+        if constraint == None:
+            indices = range(len(lobjs))
+            
+        elif constraint in ('row', 'column', 'box'):
+            if constraint == 'box' and mybox != None:
+                myrow = mybox.myrow
+                mycolumn = mybox.mycolumn
+                
+            grid = self._grids.get(name)
+            if grid is None:
+                grid = self._grids[name] = grid_index(lobjs)
+                
+            if constraint == 'row':
+                indices = grid.query_row(myrow.y0, myrow.y1)
+            elif constraint == 'column':
+                indices = grid.query_column(mycolumn.x0, mycolumn.x1)
+            else:
+                indices = grid.query_box(mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1)
+                
+        else:
+            return
+        
+        if text == None:
+            for i in indices:
+                yield lobjs[i]
+        else:
+            matcher = get_text_matcher(text, match)
+            texts = self._get_texts(name)
+            for i in indices:
+                if matcher(texts[i]):
+                    yield lobjs[i]
+                
+    def extract(self, specs):
+        """
+        Find the objects of many fields of an extraction template in one pass over each object list of the page,
+        instead of one find* scan per field. Fields with an anchor are matched in later passes, once their anchor is found.
+        
+        Args:
+            specs (list): field_spec objects of the template, with unique names
+            
+        Returns:
+            tuple of dict of field name to found object, or list of found objects for fields with all, None or empty list if not found,
+            and list of names of the fields not found, in the order of specs
+        """
+        
+        if self.instrument.enabled:
+            start = time.perf_counter()
+            
+        found = {}
+        pending = list(specs)
+        while pending:
+            ready = [spec for spec in pending if spec.anchor is None or spec.anchor in found]
+            if not ready:
+                break
+            
+            by_kind = {}
+            for spec in ready:
+                anchor = found[spec.anchor] if spec.anchor is not None else None
+                if isinstance(anchor, list):
+                    anchor = anchor[0]
+                by_kind.setdefault(spec.kind, []).append((spec,) + spec.get_bounds(anchor))
+            for kind, entries in by_kind.items():
+                found.update(self._match_fields('lobjs_' + kind, entries))
+                
+            ready = set(id(spec) for spec in ready)
+            pending = [spec for spec in pending if id(spec) not in ready]
+            
+        results = {}
+        unmatched = []
+        for spec in specs:
+            results[spec.name] = found.get(spec.name, [] if spec.all else None)
+            if spec.name not in found:
+                unmatched.append(spec.name)
+                
+        if self.instrument.enabled:
+            self.instrument.record('extract', self.pageno, time.perf_counter() - start, len(specs))
+        return results, unmatched
+    
+    def _match_fields(self, name, entries):
+        """Returns dict of field name to found object or non-empty list of objects, of the (field_spec, rows, columns) entries, in one pass over the named object list."""
+        
+        self._check_text_list(name)
+        lobjs = getattr(self, name)
+        texts = self._get_texts(name) if any(spec.text is not None for spec, _, _ in entries) else None
+        active = [(spec, rows, columns, None if spec.text is None else get_text_matcher(spec.text, spec.match)) for spec, rows, columns in entries]
+        
+        found = {}
+        for i, lobj in enumerate(lobjs):
+            done = False
+            for spec, rows, columns, matcher in active:
+                if rows is not None and not (lobj.y0 <= rows[1] and rows[0] <= lobj.y1):
+                    continue
+                if columns is not None and not (lobj.x0 <= columns[1] and columns[0] <= lobj.x1):
+                    continue
+                if matcher is not None and not matcher(texts[i]):
+                    continue
+                if spec.all:
+                    found.setdefault(spec.name, []).append(lobj)
+                else:
+                    found[spec.name] = lobj
+                    done = True
+                    
+            # Fields matching only their first object are dropped once found, the pass ends when none is left.
+            if done:
+                active = [entry for entry in active if entry[0].all or entry[0].name not in found]
+                if not active:
+                    break
+        return found
+    
+    def find_tables(self, snap = 2.0, min_coverage = 0.5, min_size = 8.0):
+        """
+        Find tables of the page from its ruling lines and rects, with its text lines assigned to their cells.
+        
+        Args:
+            snap (float): rects and lines thinner than this are ruling lines, and edges closer than this are joined
+            min_coverage (float): fraction of the width or height of a table a row or column boundary must cover
+            min_size (float): empty rows and columns narrower than this, as the padding of shaded cells, are merged into their neighbour
             
         Returns:
-            list of found LTTextLine objects
+            list of table objects, top to bottom
         """
         
-        bbox = LTTextBox()
+        return find_tables(self, snap, min_coverage, min_size)
+    
+    def get_bbox_store(self):
+        """Get bbox_store of the page, built on first call, requires numpy."""
         
-        lobjs = []
+        if self._bbox_store is None:
+            self._bbox_store = bbox_store(self)
+        return self._bbox_store
+    
+    def find_all_in_boxes(self, boxes, kind = 'text', text = None, match = 'auto'):
+        """
+        Find all objects of a kind within each of many boxes with one vectorized query, requires numpy.
         
-        if constraint == None:
-            for lobj in self.lobjs_text_line:
-                
-                if text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split())):
-                    lobjs.append(lobj)
+        Args:
+            boxes (list): box objects to search within
+            kind (str): kind of objects, value from ['text', 'text_line', 'rect', 'line', 'fig', 'img', 'char']
+            text (str): if given, only text objects containing the text are returned
+            match (str): 'auto' to match text as substring or regular expression, 'literal' for substring only, 'regex' for regular expression only
+            
+        Returns:
+            list with a list of found objects for each box
+        """
         
-        elif constraint == 'row':
-            bbox.set_bbox((-1, myrow.y0, -1, myrow.y1))
-
-            for lobj in self.lobjs_text_line:
-                if bbox.is_voverlap(lobj) and (text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split()))):
-                     lobjs.append(lobj)
+        name = 'lobjs_' + kind
+        self._check_text_list(name)
+        lobjs = getattr(self, name)
+        found = []
+        for indices in self.get_bbox_store().query_boxes(kind, boxes):
+            indices = indices.tolist()
+            if text == None:
+                found.append([lobjs[i] for i in indices])
+            else:
+                matcher = get_text_matcher(text, match)
+                texts = self._get_texts(name)
+                found.append([lobjs[i] for i in indices if matcher(texts[i])])
+        return found
+    
+    def find(self, text = '', constraint = None, mybox = None, myrow = row(), mycolumn = column(), match = 'auto'):
+        """
+        Find a text_box containing  particular string within constraints.
         
-        elif constraint == 'column':
-            bbox.set_bbox((mycolumn.x0, -1, mycolumn.x1, -1))
-             
-            for lobj in self.lobjs_text_line:
-                if bbox.is_hoverlap(lobj) and (text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split()))):
-                    lobjs.append(lobj)
-             
-        elif constraint == 'box':
-            if mybox != None:
-                myrow = mybox.myrow
-                mycolumn = mybox.mycolumn
-             
-            bbox.set_bbox((mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
-             
-            for lobj in self.lobjs_text_line:
-                if bbox.is_hoverlap(lobj) and bbox.is_voverlap(lobj) and (text.lower() in " ".join(lobj.get_text().lower().split()) or re.search(text.lower(), " ".join(lobj.get_text().lower().split()))):
-                    lobjs.append(lobj)
-                    
-        return lobjs
+        Args:
+            text (str): text to searched
+            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
+            mybox (box): box object for searching within a particular box
+            myrow (row): row object to constrain the search to a particular row
+            mycolumn (column): column object to constrain the search to a particular column
+            match (str): 'auto' to match text as substring or regular expression, 'literal' for substring only, 'regex' for regular expression only
+            
+        Returns:
+            found LTTextBox object
+        """
+        
+        return next(self._search('lobjs_text', text, constraint, mybox, myrow, mycolumn, match), None)
+    
+    def find_all(self, text = '', constraint = None, mybox = None, myrow = row(), mycolumn = column(), match = 'auto'):
+        """
+        Find all text_box containing  particular string within constraints.
+        
+        Args:
+            text (str): text to searched
+            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
+            mybox (box): box object for searching within a particular box
+            myrow (row): row object to constrain the search to a particular row
+            mycolumn (column): column object to constrain the search to a particular column
+            match (str): 'auto' to match text as substring or regular expression, 'literal' for substring only, 'regex' for regular expression only
+            
+        Returns:
+            list of found LTTextBox objects
+        """
+        
+        return list(self._search('lobjs_text', text, constraint, mybox, myrow, mycolumn, match))
+    
+    def find_text_line(self, text = '', constraint = None, mybox = None, myrow = row(), mycolumn = column(), match = 'auto'):
+        """
+        Find a text_line containing  particular string within constraints.
+        
+        Args:
+            text (str): text to searched
+            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
+            mybox (box): box object for searching within a particular box
+            myrow (row): row object to constrain the search to a particular row
+            mycolumn (column): column object to constrain the search to a particular column
+            match (str): 'auto' to match text as substring or regular expression, 'literal' for substring only, 'regex' for regular expression only
+            
+        Returns:
+            found LTTextLine object
+        """
+        
+        return next(self._search('lobjs_text_line', text, constraint, mybox, myrow, mycolumn, match), None)
+    
+    def find_text_line_all(self, text = '', constraint = None, mybox = None, myrow = row(), mycolumn = column(), match = 'auto'):
+        """
+        Find all text_line containing  particular string within constraints.
+        
+        Args:
+            text (str): text to searched
+            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
+            mybox (box): box object for searching within a particular box
+            myrow (row): row object to constrain the search to a particular row
+            mycolumn (column): column object to constrain the search to a particular column
+            match (str): 'auto' to match text as substring or regular expression, 'literal' for substring only, 'regex' for regular expression only
+            
+        Returns:
+            list of found LTTextLine objects
+        """
+        
+        return list(self._search('lobjs_text_line', text, constraint, mybox, myrow, mycolumn, match))
     
     def find_rect(self, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
         """
@@ -339,341 +2291,927 @@ class page_parser():
             found LTRect object
         """
         
-        bbox = LTRect(1, (mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
+        return next(self._search('lobjs_rect', None, constraint, mybox, myrow, mycolumn), None)
+    
+    def find_rect_all(self, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+        """
+        Find all rectangles within constraints.
+        
+        Args:
+            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
+            mybox (box): box object for searching within a particular box
+            myrow (row): row object to constrain the search to a particular row
+            mycolumn (column): column object to constrain the search to a particular column
+            
+        Returns:
+            list of found LTRect objects
+        """
         
-        if constraint == None:
-            for lobj in self.lobjs_rect:
-                return lobj
+        return list(self._search('lobjs_rect', None, constraint, mybox, myrow, mycolumn))
+    
+    def find_fig(self, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+        """
+        Find a figure within constraints.
+        
+        Args:
+            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
+            mybox (box): box object for searching within a particular box
+            myrow (row): row object to constrain the search to a particular row
+            mycolumn (column): column object to constrain the search to a particular column
+            
+        Returns:
+            found LTFigure object
+        """
+        
+        return next(self._search('lobjs_fig', None, constraint, mybox, myrow, mycolumn), None)
+    
+    def find_fig_all(self, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+        """
+        Find all figures within constraints.
+        
+        Args:
+            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
+            mybox (box): box object for searching within a particular box
+            myrow (row): row object to constrain the search to a particular row
+            mycolumn (column): column object to constrain the search to a particular column
+            
+        Returns:
+            list of found LTFigure objects
+        """
+        
+        return list(self._search('lobjs_fig', None, constraint, mybox, myrow, mycolumn))
+    
+    def find_img(self, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+        """
+        Find an image within constraints.
+        
+        Args:
+            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
+            mybox (box): box object for searching within a particular box
+            myrow (row): row object to constrain the search to a particular row
+            mycolumn (column): column object to constrain the search to a particular column
+            
+        Returns:
+            found LTImage object
+        """
+        
+        return next(self._search('lobjs_img', None, constraint, mybox, myrow, mycolumn), None)
+    
+    def find_img_all(self, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+        """
+        Find all images within constraints.
+        
+        Args:
+            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
+            mybox (box): box object for searching within a particular box
+            myrow (row): row object to constrain the search to a particular row
+            mycolumn (column): column object to constrain the search to a particular column
+            
+        Returns:
+            list of found LTImage objects
+        """
+        
+        return list(self._search('lobjs_img', None, constraint, mybox, myrow, mycolumn))
+    
+    def find_char_all(self, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+        """
+        Find all characters lying directly on the page within constraints, found only with the 'geometry' profile.
+        
+        Args:
+            constraint (str): constraint to be applied while searching for characters, value from ['row', 'column', 'box']
+            mybox (box): box object for searching within a particular box
+            myrow (row): row object to constrain the search to a particular row
+            mycolumn (column): column object to constrain the search to a particular column
+            
+        Returns:
+            list of found LTChar objects
+        """
+        
+        return list(self._search('lobjs_char', None, constraint, mybox, myrow, mycolumn))
+    
+
+class text_index():
+    """Inverted index from normalized tokens to (page-no, index) postings of the text boxes of all pages of a document."""
+    
+    def __init__(self, pages):
+        """
+        Args:
+            pages (list): page_parser objects of all pages of the document, indexed by page number, None for pages left out
+        """
+        
+        self.postings = {}
+        for pageno, page in enumerate(pages):
+            if page is None:
+                continue
+            for i, text in enumerate(page._get_texts('lobjs_text')):
+                for token in set(text.split()):
+                    self.postings.setdefault(token, []).append((pageno, i))
+                    
+        # Tokens joined in one string, so that tokens containing a query token are found with str.find.
+        self.tokens = list(self.postings)
+        self.token_starts = []
+        offset = 0
+        for token in self.tokens:
+            self.token_starts.append(offset)
+            offset += len(token) + 1
+        self.vocabulary = '\n'.join(self.tokens)
+        
+    def _find_tokens(self, part):
+        """Returns tokens containing part as a substring."""
+        
+        found = []
+        start = self.vocabulary.find(part)
+        while start != -1:
+            i = bisect.bisect_right(self.token_starts, start) - 1
+            found.append(self.tokens[i])
+            # Continue from the next token, one match per token is enough.
+            next_start = self.token_starts[i + 1] if i + 1 < len(self.tokens) else len(self.vocabulary)
+            start = self.vocabulary.find(part, next_start)
+        return found
+    
+    def find_postings(self, text, match = 'auto'):
+        """
+        Find text boxes which may contain the text, as matched by page_parser.find.
+        
+        Args:
+            text (str): text to searched
+            match (str): match mode of the search, regular expressions can not be answered from the index
+            
+        Returns:
+            sorted list of (page-no, index) postings which is a superset of the matching text boxes, else None if the index can not answer the query
+        """
+        
+        text = text.lower()
+        if match == 'regex' or (match == 'auto' and not REGEX_METACHARS.isdisjoint(text)):
+            return None
+        
+        # Every whitespace separated part of the text lies within a single token of a matching text box.
+        parts = text.split()
+        if not parts:
+            return None
+        
+        found = None
+        for part in sorted(set(parts), key = len, reverse = True):
+            postings = set()
+            for token in self._find_tokens(part):
+                postings.update(self.postings[token])
+            found = postings if found is None else found & postings
+            if not found:
+                return []
+        return sorted(found)
+    
+    def find_pagenos(self, text, match = 'auto'):
+        """Returns sorted page numbers of pages which may contain the text, else None if the index can not answer the query."""
+        
+        postings = self.find_postings(text, match)
+        if postings is None:
+            return None
+        return sorted(set(pageno for pageno, _ in postings))
+    
+class pdf_parser():
+    """Class for providing functionality to get information from different pages of a pdf file."""
+    
+    def __init__(self, fp, lazy = False, workers = None, cache = None, index = False, compact = False, keep_chars = False, pages = None, maxpages = 0, laparams = 'default', instrument = None, previous = None):
+        """
+        Takes a file-pointer of a pdf file and initializes page_parser objects for each page and stores them.
+        
+        Args:
+            fp (file, str or bytes): file-pointer of the pdf file, which must stay open while the pdf_parser object is used,
+                path of the pdf file, which is memory-mapped, or bytes-like buffer holding the pdf file, which is read without copying
+            lazy (bool): if True, a page is analyzed only the first time it is accessed instead of at construction
+            workers (int): if more than 1, pages are analyzed by that many processes and stored as page_layout objects
+            cache (layout_cache): if given, page layouts are loaded from and stored to this cache as page_layout objects
+            index (bool): if True, a text_index of all pages is built on the first find_page* call and used to skip pages not containing the text
+            compact (bool): if True, pages are stored as page_layout objects instead of pdfminer LTPage objects, as always done with workers or cache
+            keep_chars (bool): if True, page_layout objects keep characters of text lines, else only text of the lines is kept
+            pages (iterable): page numbers, negative ones counted from the end, (start, stop) tuples or range objects of the only pages to analyze,
+                other pages keep their numbers but raise PageNotFoundError in get_page
+            maxpages (int): if given, only the first maxpages of the selected pages are analyzed
+            laparams (str or LAParams): layout analysis profile from LAPARAMS_PROFILES, or LAParams object, or None to skip layout analysis
+            instrument (stage_metrics): if given, duration and object count of every stage of parsing are recorded to it, also by the page_parser objects
+            previous (pdf_parser): parser of an earlier revision of the pdf file, when the file is an incremental update of it, layouts of the pages
+                not changed by the update are taken from it instead of analyzing them again, as they are from the cache of an earlier revision, a closed or saved parser is not used
+        """
+        
+        if lazy and workers is not None and workers > 1:
+            raise ValueError('workers can not be used in lazy mode')
+        
+        self._init_state(lazy, cache, index, compact, keep_chars, instrument)
+        self.path = os.fspath(fp) if isinstance(fp, (str, os.PathLike)) else None
+        fp, self._opened = open_pdf_source(fp)
+        self.buffer = fp.buffer if isinstance(fp, buffer_reader) else None
+        
+        fp.seek(0)
+        
+        self.fp = fp
+        self.doc_hash = self._hash_document() if cache is not None else None
+        
+        rsrcmgr = PDFResourceManager()
+        self.laparams = get_laparams(laparams)
+        # Without layout analysis characters are not grouped into text boxes, and text finders raise ValueError.
+        self.text_analysis = self.laparams is not None
+        aggregator = _timed_aggregator if self.instrument.enabled else PDFPageAggregator
+        self.device = aggregator(rsrcmgr, laparams=self.laparams)
+        self.interpreter = _image_interpreter(rsrcmgr, self.device)
+        
+        # Walking the page tree is cheap, the content streams are only interpreted in _load_page.
+        if self.instrument.enabled:
+            start = time.perf_counter()
+        self.pdf_pages = list(PDFPage.get_pages(fp))
+        if self.instrument.enabled:
+            self.instrument.record('open', None, time.perf_counter() - start, len(self.pdf_pages))
+        
+        # Page numbers of the pages to analyze, the numbering of the pdf file is kept for the other pages.
+        pagenos = list(range(len(self.pdf_pages)))
+        if pages is not None:
+            pagenos = sorted(set(pageno for group in self._page_groups(pages) for pageno in group))
+        if maxpages:
+            pagenos = pagenos[:maxpages]
+        self._select_pages(pagenos)
+        
+        if previous is not None:
+            self._reuse_previous(previous)
+        elif cache is not None:
+            self._reuse_cached_revision()
+        
+        if workers is not None and workers > 1:
+            self._load_pages_parallel(workers)
+            
+        elif not lazy:
+            for pageno in self.pagenos:
+                self._load_page(pageno)
+                
+    def _init_state(self, lazy, cache, index, compact, keep_chars, instrument):
+        """Initializes the state shared by pdf_parser and stored_parser objects as that of a document without pages, the constructors fill in the rest."""
+        
+        self.path = None
+        self._opened = []
+        self.buffer = None
+        self.fp = None
+        self._pdf_reader = None
+        self.instrument = instrument or NULL_INSTRUMENT
+        self.lazy = lazy
+        self.cache = cache
+        self.index = index
+        self.text_index = None
+        # Text boxes recognized by ocr_pages, by page number, added to every page_parser object created for the page.
+        self.ocr_texts = {}
+        self.compact = compact
+        self.keep_chars = keep_chars
+        self.doc_hash = None
+        # (size, sha256 hex-digest) of the prefixes of the pdf file which may be earlier revisions, found while hashing it for the cache.
+        self.revision_hashes = []
+        self.laparams = None
+        # None if not known, pages then tell it from their layouts.
+        self.text_analysis = None
+        self.device = None
+        self.interpreter = None
+        self.pdf_pages = []
+        self.layout_list = []
+        self.page_list = []
+        self.pagenos = []
+        self._selected = None
+        # Page numbers of the pages whose layouts were taken from an earlier revision.
+        self.reused_pagenos = []
+        
+    def _select_pages(self, pagenos):
+        """Sets page numbers of the pages to analyze, out of the pages in pdf_pages, none of them analyzed yet."""
+        
+        self.layout_list = [None] * len(self.pdf_pages)
+        self.page_list = [None] * len(self.pdf_pages)
+        self.pagenos = pagenos
+        self._selected = set(pagenos) if len(pagenos) < len(self.pdf_pages) else None
+        
+    def close(self):
+        """Closes the file and memory-map opened by the pdf_parser object for a path or buffer source, the parser no longer reads the pdf file."""
+        
+        self.buffer = None
+        self.fp = None
+        for opened in reversed(self._opened):
+            opened.close()
+        self._opened = []
+        
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+        
+    @property
+    def pdf_reader(self):
+        """PdfFileReader of the pdf file, created on first use as it is only needed for writing page streams."""
+        
+        if self._pdf_reader is None:
+            if self.instrument.enabled:
+                start = time.perf_counter()
+            self._pdf_reader = PdfFileReader(self.fp)
+            if self.instrument.enabled:
+                self.instrument.record('pdf_reader', None, time.perf_counter() - start)
+        return self._pdf_reader
+    
+    def _check_pageno(self, pageno):
+        """Returns non-negative index of the page number, raises PageNotFoundError for not existing page."""
+        
+        page_len = len(self.pdf_pages)
+        if pageno < page_len and pageno >= -page_len:
+            return pageno % page_len
+        else:
+            raise PageNotFoundError('Required page number not found')
+            
+    def _check_selected(self, pageno):
+        """Returns non-negative index of the page number, raises PageNotFoundError for not existing or not selected page."""
+        
+        pageno = self._check_pageno(pageno)
+        if self._selected is not None and pageno not in self._selected:
+            raise PageNotFoundError('Required page number not selected')
+        return pageno
+    
+    def _load_page(self, pageno):
+        """Runs layout analysis of a page if not done yet and returns its page_parser object."""
+        
+        if self.page_list[pageno] is None:
+            self._set_layout(pageno, self._analyze_page(pageno))
+            
+        return self.page_list[pageno]
+    
+    def _analyze_page(self, pageno):
+        """
+        Returns layout of a page from the cache, else runs layout analysis of the page, without storing it.
+        The 'interpret', 'layout' and 'compact' stages are recorded to the instrument if it is enabled.
+        """
+        
+        layout = self._get_cached_layout(pageno)
+        if layout is not None:
+            return layout
+        
+        timed = self.instrument.enabled
+        if timed:
+            start = time.perf_counter()
+        self.interpreter.process_page(_load_contents(self.pdf_pages[pageno]))
+        layout = self.device.get_result()
+        if timed:
+            layout_seconds = self.device.layout_seconds
+            self.instrument.record('interpret', pageno, time.perf_counter() - start - layout_seconds)
+            self.instrument.record('layout', pageno, layout_seconds, len(layout))
+        
+        if self.compact or self.cache is not None:
+            if timed:
+                start = time.perf_counter()
+            layout = compact_layout(layout, self.keep_chars, self.text_analysis)
+            if timed:
+                self.instrument.record('compact', pageno, time.perf_counter() - start, len(layout.objs))
+        if self.cache is not None:
+            self.cache.put(self._cache_key(pageno), layout)
+        return layout
+    
+    def _set_layout(self, pageno, layout):
+        self.layout_list[pageno] = layout
+        self.page_list[pageno] = self._make_page(pageno, layout)
+        
+    def _make_page(self, pageno, layout):
+        page = page_parser(layout, self.instrument, pageno, self.text_analysis)
+        if pageno in self.ocr_texts:
+            page.add_text_boxes(self.ocr_texts[pageno])
+        return page
+        
+    def _hash_document(self):
+        """Returns sha256 hex-digest of the content of the pdf file, storing hex-digests of the prefixes which may be earlier revisions in revision_hashes."""
+        
+        chunk_size = 1024 * 1024
+        if self.buffer is not None:
+            chunks = (self.buffer[i:i + chunk_size] for i in range(0, len(self.buffer), chunk_size))
+        else:
+            self.fp.seek(0)
+            chunks = iter(lambda: self.fp.read(chunk_size), b'')
+            
+        doc_hash, self.revision_hashes = hash_revisions(chunks)
+        self.fp.seek(0)
+        return doc_hash
+    
+    def _cache_key(self, pageno):
+        return self.cache.make_key(self.doc_hash, self.laparams, pageno, self.keep_chars)
+    
+    def _get_cached_layout(self, pageno):
+        """Returns page_layout object of the page from the cache, else None."""
+        
+        if self.cache is None:
+            return None
+        if not self.instrument.enabled:
+            return self.cache.get(self._cache_key(pageno))
+        
+        start = time.perf_counter()
+        layout = self.cache.get(self._cache_key(pageno))
+        if layout is not None:
+            self.instrument.record('cache_load', pageno, time.perf_counter() - start, len(layout.objs))
+        return layout
+    
+    def _read_content(self):
+        """Returns content of the pdf file, the buffer itself for a path or buffer source."""
+        
+        if self.buffer is not None:
+            return self.buffer
+        self.fp.seek(0)
+        data = self.fp.read()
+        self.fp.seek(0)
+        return data
+    
+    def get_revisions(self):
+        """
+        Get revisions of the pdf file, each incremental update appending a revision.
+        
+        Returns:
+            list of sizes in bytes of the revisions, the last one being the whole file
+        """
+        
+        return find_revisions(self._read_content())
+    
+    def _reuse_layout(self, pageno, layout, ocr_texts = None):
+        """Stores layout of a page taken from an earlier revision, as if the page was analyzed."""
+        
+        if isinstance(layout, LTPage) and (self.compact or self.cache is not None):
+            layout = compact_layout(layout, self.keep_chars, self.text_analysis)
+        if self.cache is not None:
+            self.cache.put(self._cache_key(pageno), layout)
+        if ocr_texts:
+            self.ocr_texts[pageno] = ocr_texts
+        self._set_layout(pageno, layout)
+        self.reused_pagenos.append(pageno)
+        
+    def _reuse_previous(self, previous):
+        """Stores layouts of the pages unchanged since the revision parsed by previous, if this pdf file is an incremental update of it."""
+        
+        if previous.fp is None or getattr(previous.laparams, '__dict__', None) != getattr(self.laparams, '__dict__', None):
+            return
+        
+        if self.instrument.enabled:
+            start = time.perf_counter()
+        old = previous._read_content()
+        data = self._read_content()
+        if len(old) > len(data) or data[:len(old)] != old:
+            return
+        
+        for pageno, old_pageno in sorted(unchanged_pages(self.pdf_pages, previous.pdf_pages, len(old)).items()):
+            layout = previous.layout_list[old_pageno]
+            if layout is None or (self._selected is not None and pageno not in self._selected):
+                continue
+            # Characters dropped from a compact layout can not be restored.
+            if not isinstance(layout, LTPage) and previous.keep_chars != self.keep_chars:
+                continue
+            self._reuse_layout(pageno, layout, previous.ocr_texts.get(old_pageno))
+            
+        if self.instrument.enabled:
+            self.instrument.record('revision', None, time.perf_counter() - start, len(self.reused_pagenos))
+            
+    def _reuse_cached_revision(self):
+        """
+        Takes layouts of unchanged pages from the cache of the newest earlier revision whose first selected page is cached, if the document itself is not.
+        Earlier revisions are only parsed once the cache is found to hold one, so opening a document without cached revisions costs a few file checks.
+        """
+        
+        if not self.pagenos or not self.revision_hashes or self._cache_key(self.pagenos[0]) in self.cache:
+            return
+        
+        if self.instrument.enabled:
+            start = time.perf_counter()
+        for end, doc_hash in reversed(self.revision_hashes):
+            if self.cache.make_key(doc_hash, self.laparams, self.pagenos[0], self.keep_chars) not in self.cache:
+                continue
+            try:
+                old_pages = list(PDFPage.get_pages(buffer_reader(self._read_content()[:end])))
+            except Exception:
+                # The part of the file before an end-of-file marker is not always a complete revision, as with linearized files.
+                continue
+            
+            for pageno, old_pageno in sorted(unchanged_pages(self.pdf_pages, old_pages, end).items()):
+                if self._selected is not None and pageno not in self._selected:
+                    continue
+                layout = self.cache.get(self.cache.make_key(doc_hash, self.laparams, old_pageno, self.keep_chars))
+                if layout is not None:
+                    self._reuse_layout(pageno, layout)
+            break
+            
+        if self.instrument.enabled:
+            self.instrument.record('revision', None, time.perf_counter() - start, len(self.reused_pagenos))
+    
+    def _load_pages_parallel(self, workers):
+        """Runs layout analysis of all pages not found in the cache in a pool of worker processes, each analyzing slices of pages."""
+        
+        pagenos = []
+        for pageno in self.pagenos:
+            if self.page_list[pageno] is not None:
+                continue
+            layout = self._get_cached_layout(pageno)
+            if layout is None:
+                pagenos.append(pageno)
+            else:
+                self._set_layout(pageno, layout)
+        
+        if not pagenos:
+            return
+        
+        # Workers memory-map the file themselves when it has a path, else they get a copy of the content.
+        if self.path is not None:
+            source = self.path
+        elif self.buffer is not None:
+            source = self.buffer.tobytes()
+        else:
+            self.fp.seek(0)
+            source = self.fp.read()
+        
+        # Several slices per worker keep the pool busy when some pages are much heavier than others.
+        step = max(1, -(-len(pagenos) // (workers * 4)))
+        slices = [pagenos[i:i + step] for i in range(0, len(pagenos), step)]
+        
+        if self.instrument.enabled:
+            start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers = workers, initializer = _init_page_worker, initargs = (source, self.laparams, self.keep_chars)) as executor:
+            for page_slice, layouts in zip(slices, executor.map(_analyze_page_slice, slices)):
+                for pageno, layout in zip(page_slice, layouts):
+                    if self.cache is not None:
+                        self.cache.put(self._cache_key(pageno), layout)
+                    self._set_layout(pageno, layout)
+                    
+        if self.instrument.enabled:
+            self.instrument.record('parallel', None, time.perf_counter() - start, len(pagenos))
+                    
+    def _iter_pages(self, text = None, match = 'auto'):
+        """Yields page-no and page_parser object of all pages in order, analyzing pages on demand, skipping pages the text_index rules out for the text."""
+        
+        pagenos = None
+        if self.index and text is not None:
+            pagenos = self.build_index().find_pagenos(text, match)
+        if pagenos is None:
+            pagenos = self.pagenos
+            
+        # Without text analysis only text added by OCR can be found, the other pages would raise ValueError.
+        if text is not None and self.text_analysis is False:
+            if not self.ocr_texts:
+                raise ValueError('Text boxes are not extracted with the layout analysis profile of the pdf_parser, use find_char_all of the pages or another profile')
+            pagenos = [pageno for pageno in pagenos if pageno in self.ocr_texts]
+            
+        for pageno in pagenos:
+            yield pageno, self._load_page(pageno)
+            
+    def iter_pages(self):
+        """
+        Iterate over page_parser objects of all pages, analyzing one page at a time without storing it in the pdf_parser object.
+        Combined with lazy mode, memory use stays flat as the layout of a page, and the content streams decoded for it,
+        are released once the next page is requested.
+        Pages which were already analyzed are yielded from the stored ones.
+        
+        Returns:
+            generator of page_parser objects in page order
+        """
+        
+        for pageno in self.pagenos:
+            page = self.page_list[pageno]
+            if page is None:
+                page = self._make_page(pageno, self._analyze_page(pageno))
+                # The aggregator would otherwise keep the last LTPage alive.
+                if self.device is not None:
+                    self.device.result = None
+                    _release_contents(self.pdf_pages[pageno])
+            yield page
+            
+    def get_image_data(self, image, decoded = True):
+        """
+        Load data of an image on demand, without keeping it in the pdf_parser object.
+        
+        Args:
+            image (image_object or LTImage): image from lobjs_img or find_img* of a page
+            decoded (bool): if True, filters other than DCTDecode, JPXDecode and JBIG2Decode are applied, so JPEG and JPEG 2000 images
+                are returned as files, else the stream is returned as stored in the pdf file
+                
+        Returns:
+            bytes of the image data
+        """
         
-        elif constraint == 'row':
-            bbox.set_bbox((-1, myrow.y0, -1, myrow.y1))
-
-            for lobj in self.lobjs_rect:
-                if bbox.is_voverlap(lobj):
-                     return lobj
+        objid = image.objid if isinstance(image, image_object) else image.stream.objid
+        if objid is None:
+            # Inline images are kept with the page.
+            if isinstance(image, image_object):
+                return image.data
+            return image.stream.get_data() if decoded else image.stream.get_rawdata()
         
-        elif constraint == 'column':
-            bbox.set_bbox((mycolumn.x0, -1, mycolumn.x1, -1))
-             
-            for lobj in self.lobjs_rect:
-                if bbox.is_hoverlap(lobj):
-                    return lobj
-             
-        elif constraint == 'box':
-            if mybox != None:
-                myrow = mybox.myrow
-                mycolumn = mybox.mycolumn
-             
-            bbox.set_bbox((mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
-             
-            for lobj in self.lobjs_rect:
-                if bbox.is_hoverlap(lobj) and bbox.is_voverlap(lobj):
-                    return lobj
-                
-                
-    def find_rect_all(self, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+        stream = _resolve_uncached(PDFObjRef(self.pdf_pages[0].doc, objid))
+        return stream.get_data() if decoded else stream.get_rawdata()
+    
+    def _iter_image_streams(self, pagenos):
+        """Yields page-no, name and object id of image XObjects of the pages and of the form XObjects they use, each image once."""
+        
+        seen = set()
+        for pageno in pagenos:
+            stack = [self.pdf_pages[pageno].resources]
+            while stack:
+                resources = resolve1(stack.pop()) or {}
+                for name, ref in (resolve1(resources.get('XObject')) or {}).items():
+                    if not isinstance(ref, PDFObjRef) or ref.objid in seen:
+                        continue
+                    seen.add(ref.objid)
+                    xobj = _resolve_uncached(ref)
+                    if not isinstance(xobj, PDFStream):
+                        continue
+                    subtype = resolve1(xobj.get('Subtype'))
+                    if subtype is LITERAL_IMAGE:
+                        yield pageno, name, ref.objid
+                    elif subtype is LITERAL_FORM and 'Resources' in xobj:
+                        stack.append(xobj['Resources'])
+                        
+    def export_images(self, directory, pagenos = None):
         """
-        Find all rectangles within constraints.
+        Write every image XObject of the pdf file to a directory in one pass over the page resources, without layout analysis.
+        JPEG and JPEG 2000 streams are written unchanged as .jpg and .jp2 files, JBIG2 streams as .jb2 files,
+        grayscale, RGB and bilevel samples as .png files, with their Decode array and 8 bit soft mask applied,
+        and other images, or images whose Decode array or mask can not be applied, as their decoded samples in .bin files.
+        An image used on several pages is written once, named page<page-no>_<object id>_<name> after the first page using it,
+        so that different images of a page with the same name, as in different form XObjects, get different files.
         
         Args:
-            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
-            mybox (box): box object for searching within a particular box
-            myrow (row): row object to constrain the search to a particular row
-            mycolumn (column): column object to constrain the search to a particular column
+            directory (str): directory to write the images into, created if missing
+            pagenos (list): page numbers of the pages whose images are written, defaults to the selected pages
             
         Returns:
-            list of found LTRect objects
+            list of paths of the written files
         """
         
-        bbox = LTRect(1, (mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
-        
-        lobjs = []
+        pagenos = self.pagenos if pagenos is None else [self._check_selected(pageno) for pageno in pagenos]
+        os.makedirs(directory, exist_ok = True)
+        doc = self.pdf_pages[0].doc if self.pdf_pages else None
+        
+        paths = []
+        for pageno, name, objid in self._iter_image_streams(pagenos):
+            # Each stream is loaded uncached, so only one image is held at a time.
+            stream = _resolve_uncached(PDFObjRef(doc, objid))
+            filters = [f.name for f, _ in stream.get_filters() if isinstance(f, PSLiteral)]
+            format = _image_format(filters)
+            data = stream.get_data()
+            
+            ext = {'jpeg': '.jpg', 'jp2': '.jp2', 'jbig2': '.jb2'}.get(format, '.bin')
+            if format == 'raw':
+                png = _image_png(stream, data)
+                if png is not None:
+                    data, ext = png, '.png'
+                        
+            path = os.path.join(directory, 'page%d_%d_%s%s' % (pageno, objid, re.sub(r'[^\w.-]', '_', literal_name(name)), ext))
+            with open(path, 'wb') as f:
+                f.write(data)
+            paths.append(path)
+        return paths
+    
+    def is_image_only(self, pageno):
+        """
+        Check whether a page draws images but no text, as a scanned page, from its resources without layout analysis.
         
-        if constraint == None:
-            for lobj in self.lobjs_rect:
-                lobjs.append(lobj)
+        Args:
+            pageno (int): page number of the page
+            
+        Returns:
+            True if the page is image-only, else False
+        """
         
-        elif constraint == 'row':
-            bbox.set_bbox((-1, myrow.y0, -1, myrow.y1))
-
-            for lobj in self.lobjs_rect:
-                if bbox.is_voverlap(lobj):
-                     lobjs.append(lobj)
+        return is_image_only_page(self.pdf_pages[self._check_pageno(pageno)])
+    
+    def get_image_only_pagenos(self):
+        """Get page numbers of the selected pages which are image-only, without layout analysis."""
         
-        elif constraint == 'column':
-            bbox.set_bbox((mycolumn.x0, -1, mycolumn.x1, -1))
-             
-            for lobj in self.lobjs_rect:
-                if bbox.is_hoverlap(lobj):
-                    lobjs.append(lobj)
-             
-        elif constraint == 'box':
-            if mybox != None:
-                myrow = mybox.myrow
-                mycolumn = mybox.mycolumn
-             
-            bbox.set_bbox((mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
-             
-            for lobj in self.lobjs_rect:
-                if bbox.is_hoverlap(lobj) and bbox.is_voverlap(lobj):
-                    lobjs.append(lobj)
-                    
-        return lobjs
+        return [pageno for pageno in self.pagenos if is_image_only_page(self.pdf_pages[pageno])]
     
-    def find_fig(self, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+    def _get_lt_images(self, pageno):
+        """Returns LTImage objects of figures of a page, also of nested figures, analyzing the page again if its layout is not stored as LTPage."""
+        
+        layout = self.layout_list[pageno]
+        if not isinstance(layout, LTPage):
+            self.interpreter.process_page(_load_contents(self.pdf_pages[pageno]))
+            layout = self.device.get_result()
+            self.device.result = None
+        return get_lt_images(layout)
+    
+    def ocr_pages(self, backend = None, pagenos = None, workers = None):
         """
-        Find a figure within constraints.
+        Recognize text of image-only pages with an OCR backend and add it to their page_parser objects as text boxes, so that find* queries work.
+        Images of all pages are recognized in one pool of worker processes.
         
         Args:
-            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
-            mybox (box): box object for searching within a particular box
-            myrow (row): row object to constrain the search to a particular row
-            mycolumn (column): column object to constrain the search to a particular column
+            backend (callable): OCR backend, as tesseract_ocr, defaults to tesseract_ocr()
+            pagenos (list): page numbers of the pages to recognize, defaults to the selected pages found by get_image_only_pagenos
+            workers (int): number of worker processes, defaults to number of CPUs, with 1 the images are recognized in this process
             
         Returns:
-            found LTFigure object
+            list of page numbers of the recognized pages
         """
         
-        bbox = LTRect(1, (mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
+        if backend is None:
+            backend = tesseract_ocr()
+        if pagenos is None:
+            pagenos = self.get_image_only_pagenos()
+        else:
+            pagenos = [self._check_selected(pageno) for pageno in pagenos]
+            
+        if self.instrument.enabled:
+            start = time.perf_counter()
+        jobs = []
+        for pageno in pagenos:
+            for lt_image in self._get_lt_images(pageno):
+                image = ocr_image.from_lt_image(lt_image)
+                if image is not None:
+                    jobs.append((pageno, lt_image.bbox, lt_image.srcsize, image))
+                    
+        if workers == 1 or len(jobs) <= 1:
+            results = [backend(image) for _, _, _, image in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers = workers) as executor:
+                results = list(executor.map(backend, [image for _, _, _, image in jobs]))
+                
+        for pageno in pagenos:
+            self.ocr_texts[pageno] = []
+        for (pageno, bbox, size, _), blocks in zip(jobs, results):
+            self.ocr_texts[pageno].extend(ocr_text_boxes(blocks, bbox, size))
+            
+        for pageno in pagenos:
+            if self.page_list[pageno] is not None:
+                self.page_list[pageno] = self._make_page(pageno, self.layout_list[pageno])
+        self.text_index = None
+        
+        if self.instrument.enabled:
+            self.instrument.record('ocr', None, time.perf_counter() - start, len(jobs))
+        return pagenos
+    
+    def build_index(self):
+        """
+        Build text_index of all selected pages of the pdf file if not built yet, analyzing them.
         
-        if constraint == None:
-            for lobj in self.lobjs_fig:
-                return lobj
+        Returns:
+            text_index object of the pdf file
+        """
         
-        elif constraint == 'row':
-            bbox.set_bbox((-1, myrow.y0, -1, myrow.y1))
+        if self.text_index is None:
+            self.get_pages()
+            self.text_index = text_index(self.page_list)
+        return self.text_index
+    
 
-            for lobj in self.lobjs_fig:
-                if bbox.is_voverlap(lobj):
-                     return lobj
+    def save(self, dest):
+        """
+        Save page layouts of all selected pages in the layout_store format, from which pdf_parser.load rebuilds the parser without the pdf file.
+        Pages not analyzed yet are analyzed one at a time without being stored, text recognized by ocr_pages is saved with its page.
         
-        elif constraint == 'column':
-            bbox.set_bbox((mycolumn.x0, -1, mycolumn.x1, -1))
-             
-            for lobj in self.lobjs_fig:
-                if bbox.is_hoverlap(lobj):
-                    return lobj
-             
-        elif constraint == 'box':
-            if mybox != None:
-                myrow = mybox.myrow
-                mycolumn = mybox.mycolumn
-             
-            bbox.set_bbox((mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
-             
-            for lobj in self.lobjs_fig:
-                if bbox.is_hoverlap(lobj) and bbox.is_voverlap(lobj):
-                    return lobj
+        Args:
+            dest (str or file): path of the file, or writable binary file object
+        """
+        
+        def iter_layouts():
+            for pageno in self.pagenos:
+                layout = self.layout_list[pageno]
+                if layout is None:
+                    layout = self._analyze_page(pageno)
+                if isinstance(layout, LTPage):
+                    layout = compact_layout(layout, self.keep_chars, self.text_analysis)
+                if self.ocr_texts.get(pageno):
+                    layout = page_layout(layout.pageid, layout.bbox, layout.rotate, tuple(layout.objs) + tuple(self.ocr_texts[pageno]))
+                yield pageno, layout
                 
-    def find_fig_all(self, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+        layout_store.write(dest, iter_layouts(), len(self.pdf_pages), self.keep_chars)
+        
+    @classmethod
+    def load(cls, source, lazy = True, index = False, instrument = None):
         """
-        Find all figures within constraints.
+        Load a parser saved by pdf_parser.save, answering page and find* queries without the pdf file.
         
         Args:
-            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
-            mybox (box): box object for searching within a particular box
-            myrow (row): row object to constrain the search to a particular row
-            mycolumn (column): column object to constrain the search to a particular column
+            source (str or bytes): path of the saved file, which is memory-mapped, or bytes-like buffer holding it
+            lazy (bool): if True, the page_parser object of a page is built the first time the page is accessed
+            index (bool): if True, a text_index of all pages is built on the first find_page* call
+            instrument (stage_metrics): if given, stages of page_parser objects are recorded to it
             
         Returns:
-            list of found LTFigure objects
+            stored_parser object
         """
         
-        bbox = LTRect(1, (mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
-        
-        lobjs = []
-        
-        if constraint == None:
-            for lobj in self.lobjs_fig:
-                lobjs.append(lobj)
-        
-        elif constraint == 'row':
-            bbox.set_bbox((-1, myrow.y0, -1, myrow.y1))
-
-            for lobj in self.lobjs_fig:
-                if bbox.is_voverlap(lobj):
-                     lobjs.append(lobj)
-        
-        elif constraint == 'column':
-            bbox.set_bbox((mycolumn.x0, -1, mycolumn.x1, -1))
-             
-            for lobj in self.lobjs_fig:
-                if bbox.is_hoverlap(lobj):
-                    lobjs.append(lobj)
-             
-        elif constraint == 'box':
-            if mybox != None:
-                myrow = mybox.myrow
-                mycolumn = mybox.mycolumn
-             
-            bbox.set_bbox((mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
-             
-            for lobj in self.lobjs_fig:
-                if bbox.is_hoverlap(lobj) and bbox.is_voverlap(lobj):
-                    lobjs.append(lobj)
-                    
-        return lobjs
+        return stored_parser(source, lazy, index, instrument)
     
-    def find_img(self, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+    def get__lt_page(self, pageno):
         """
-        Find an image within constraints.
+        Get LTPage object of a particular page by page-no from the pdf_parser object.
         
         Args:
-            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
-            mybox (box): box object for searching within a particular box
-            myrow (row): row object to constrain the search to a particular row
-            mycolumn (column): column object to constrain the search to a particular column
+            pageno (int): page number of the required page
             
         Returns:
-            found LTImage object
+            LTPage object of that page
         """
         
-        bbox = LTRect(1, (mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
-        
-        if constraint == None:
-            for lobj in self.lobjs_img:
-                return lobj
-        
-        elif constraint == 'row':
-            bbox.set_bbox((-1, myrow.y0, -1, myrow.y1))
-
-            for lobj in self.lobjs_img:
-                if bbox.is_voverlap(lobj):
-                     return lobj
-        
-        elif constraint == 'column':
-            bbox.set_bbox((mycolumn.x0, -1, mycolumn.x1, -1))
-             
-            for lobj in self.lobjs_img:
-                if bbox.is_hoverlap(lobj):
-                    return lobj
-             
-        elif constraint == 'box':
-            if mybox != None:
-                myrow = mybox.myrow
-                mycolumn = mybox.mycolumn
-             
-            bbox.set_bbox((mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
-             
-            for lobj in self.lobjs_img:
-                if bbox.is_hoverlap(lobj) and bbox.is_voverlap(lobj):
-                    return lobj
+        pageno = self._check_selected(pageno)
+        self._load_page(pageno)
+        return self.layout_list[pageno]
+            
+    def _write_pages(self, pagenos, sink):
+        """Writes pages of the given page numbers as one pdf document into a writable binary file object."""
+        
+        reader = self.pdf_reader
+        if self.instrument.enabled:
+            start = time.perf_counter()
+        writer = PdfFileWriter()
+        for pageno in pagenos:
+            writer.addPage(reader.getPage(pageno))
+        writer.write(sink)
+        if self.instrument.enabled:
+            self.instrument.record('page_stream', pagenos[0] if len(pagenos) == 1 else None, time.perf_counter() - start, len(pagenos))
+        
+    def _page_groups(self, ranges):
+        """Converts page numbers, (start, stop) tuples and range objects into lists of non-negative page numbers, raises ValueError for empty ranges."""
+        
+        if ranges is None:
+            ranges = range(len(self.pdf_pages))
+            
+        for item in ranges:
+            if isinstance(item, tuple):
+                item = range(*item)
+            if isinstance(item, range):
+                if not item:
+                    raise ValueError('Page range %r is empty' % (item,))
+                yield [self._check_pageno(pageno) for pageno in item]
+            else:
+                yield [self._check_pageno(item)]
                 
-    def find_img_all(self, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+    def get_page_stream(self, pageno):
         """
-        Find all images within constraints.
+        Get a particular page by page-no as a separate pdf document.
         
         Args:
-            constraint (str): constraint to be applied while searching for text-box, value from ['row', 'column', 'box']
-            mybox (box): box object for searching within a particular box
-            myrow (row): row object to constrain the search to a particular row
-            mycolumn (column): column object to constrain the search to a particular column
+            pageno (int): page number of the required page
             
         Returns:
-            list of found LTImage objects
+            bytes of the pdf document
         """
         
-        bbox = LTRect(1, (mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
+        stream = io.BytesIO()
+        self._write_pages([self._check_pageno(pageno)], stream)
+        return stream.getvalue()
+    
+    def find_page_stream(self, text, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+        """
+        Find a page from the pdf containing a particular text within constraints and get it as a separate pdf document.
         
-        lobjs = []
+        Returns:
+            bytes of the pdf document of the found page, else empty bytes
+        """
         
-        if constraint == None:
-            for lobj in self.lobjs_img:
-                lobjs.append(lobj)
+        pageno = self.find_page_no(text, constraint = constraint, mybox = mybox, myrow = myrow, mycolumn = mycolumn)
         
-        elif constraint == 'row':
-            bbox.set_bbox((-1, myrow.y0, -1, myrow.y1))
-
-            for lobj in self.lobjs_img:
-                if bbox.is_voverlap(lobj):
-                     lobjs.append(lobj)
+        if pageno != None:
+            return self.get_page_stream(pageno)
         
-        elif constraint == 'column':
-            bbox.set_bbox((mycolumn.x0, -1, mycolumn.x1, -1))
-             
-            for lobj in self.lobjs_img:
-                if bbox.is_hoverlap(lobj):
-                    lobjs.append(lobj)
-             
-        elif constraint == 'box':
-            if mybox != None:
-                myrow = mybox.myrow
-                mycolumn = mybox.mycolumn
-             
-            bbox.set_bbox((mycolumn.x0, myrow.y0, mycolumn.x1, myrow.y1))
-             
-            for lobj in self.lobjs_img:
-                if bbox.is_hoverlap(lobj) and bbox.is_voverlap(lobj):
-                    lobjs.append(lobj)
-                    
-        return lobjs
-    
-    
-class pdf_parser():
-    """Class for providing functionality to get information from different pages of a pdf file."""
+        return b''
     
-    def __init__(self, fp):
-        """Takes a file-pointer of a pdf file and initializes page_parser objects for each page and stores them."""
-        
-        fp.seek(0)
-        self.pdf_reader = PdfFileReader(fp)
-        
-        fp.seek(0)
-        
-        rsrcmgr = PDFResourceManager()
-        laparams = LAParams()
-        device = PDFPageAggregator(rsrcmgr, laparams=laparams)
-        interpreter = PDFPageInterpreter(rsrcmgr, device)
-        pages = PDFPage.get_pages(fp)
+    def iter_page_streams(self, ranges = None):
+        """
+        Split the pdf file into separate pdf documents, one for each page or page range.
+        All documents are written from the same PdfFileReader, so objects of the pdf file are parsed only once,
+        but each document is serialized separately with its own copy of the objects it uses, like fonts and images,
+        as every document has to stand alone. Objects shared by pages of a range are written once in the document of that range.
         
-        self.layout_list = []
-        self.page_list = []
+        Args:
+            ranges (iterable): page numbers, (start, stop) tuples or range objects, each giving one document, default is every page separately,
+                empty ranges raise ValueError
+            
+        Returns:
+            generator of (list of page numbers, memoryview of the pdf document) tuples, the memoryview refers to the written buffer without copying it
+        """
         
-        for page in list(pages):
-            interpreter.process_page(page)
-            layout = device.get_result()
-            self.layout_list.append(layout)
-            self.page_list.append(page_parser(layout))
+        for pagenos in self._page_groups(ranges):
+            stream = io.BytesIO()
+            self._write_pages(pagenos, stream)
+            yield pagenos, stream.getbuffer()
             
-    def get__lt_page(self, pageno):
+    def write_page_streams(self, dest, ranges = None):
         """
-        Get page_parser object of a particular page by page-no from the pdf_parser object.
+        Split the pdf file into separate pdf documents, one for each page or page range, writing them straight to files.
         
         Args:
-            pageno (int): page number of the required page
+            dest (str or callable): directory, created if missing, in which files named page_<first page-no>.pdf or page_<first>-<last>.pdf are written,
+                or a function taking the list of page numbers and returning a writable binary file object, which is closed after writing
+            ranges (iterable): page numbers, (start, stop) tuples or range objects, each giving one document, default is every page separately,
+                empty ranges raise ValueError
             
         Returns:
-            page_parser object of that page
+            list of (list of page numbers, path or file object) tuples of the written documents
         """
         
-        page_len = len(self.layout_list)
-        if pageno < page_len and pageno >= -page_len:
-            return self.layout_list[pageno]
-        else:
-            raise PageNotFoundError('Required page number not found')
+        if not callable(dest):
+            os.makedirs(dest, exist_ok = True)
             
-    def get_page_stream(self, pageno):
-        page_len = len(self.layout_list)
-        if pageno < page_len and pageno >= -page_len:
-            writer = PdfFileWriter()
-            writer.addPage(self.pdf_reader.getPage(pageno))
-            stream = io.BytesIO()
-            writer.write(stream)
-            return stream.getvalue()
-        else:
-            raise PageNotFoundError('Required page number not found')
-    
-    def find_page_stream(self, text, constraint = None, mybox = None, myrow = row(), mycolumn = column()):
-        pageno = self.find_page_no(text, constraint = None, mybox = None, myrow = row(), mycolumn = column())
-        
-        if pageno != None:
-            writer = PdfFileWriter()
-            writer.addPage(self.pdf_reader.getPage(pageno))
-            stream = io.BytesIO()
-            writer.write(stream)
-            return stream.getvalue()
-        
-        return b''
+        written = []
+        for pagenos in self._page_groups(ranges):
+            if callable(dest):
+                sink = dest(pagenos)
+            else:
+                name = 'page_%d.pdf' % pagenos[0] if len(pagenos) == 1 else 'page_%d-%d.pdf' % (pagenos[0], pagenos[-1])
+                sink = open(os.path.join(dest, name), 'wb')
+                
+            with sink:
+                self._write_pages(pagenos, sink)
+            written.append((pagenos, sink if callable(dest) else sink.name))
+        return written
             
     def get_page(self, pageno):
         """
@@ -686,23 +3224,23 @@ class pdf_parser():
             page_parser object of that page
         """
         
-        page_len = len(self.page_list)
-        if pageno < page_len and pageno >= -page_len:
-            return self.page_list[pageno]
-        else:
-            raise PageNotFoundError('Required page number not found')
+        return self._load_page(self._check_selected(pageno))
             
     def get_no_pages(self):
-        """Get number of pages in the pdf file."""
+        """Get number of pages in the pdf file, including pages not selected for analysis."""
         
-        return len(self.page_list)
+        return len(self.pdf_pages)
     
     def get_pages(self):
-        """Get list of page_parser objects of all pages of the pdf file."""
+        """Get list of page_parser objects of all selected pages of the pdf file."""
         
-        return self.page_list
+        for pageno in self.pagenos:
+            self._load_page(pageno)
+        if self._selected is None:
+            return self.page_list
+        return [self.page_list[pageno] for pageno in self.pagenos]
     
-    def find_page_no(self, text="", constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+    def find_page_no(self, text="", constraint = None, mybox = None, myrow = row(), mycolumn = column(), match = 'auto'):
         """
         Find a page_no from the pdf containing a particular text within constraints
         
@@ -712,19 +3250,20 @@ class pdf_parser():
             mybox (box): box object for searching within a particular box
             myrow (row): row object to constrain the search to a particular row
             mycolumn (column): column object to constrain the search to a particular column
+            match (str): 'auto' to match text as substring or regular expression, 'literal' for substring only, 'regex' for regular expression only
             
         Returns:
             page_parser object of the found page, else None
         
         """
         
-        for i,page in enumerate(self.page_list):
-            if page.find(text = text, constraint = constraint, mybox = mybox, myrow = myrow, mycolumn = mycolumn):
+        for i, page in self._iter_pages(text, match):
+            if page.find(text = text, constraint = constraint, mybox = mybox, myrow = myrow, mycolumn = mycolumn, match = match) != None:
                 return i
             
         return None
     
-    def find_page(self, text = "", constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+    def find_page(self, text = "", constraint = None, mybox = None, myrow = row(), mycolumn = column(), match = 'auto'):
         """
         Find a page from the pdf containing a particular text within constraints
         
@@ -734,19 +3273,20 @@ class pdf_parser():
             mybox (box): box object for searching within a particular box
             myrow (row): row object to constrain the search to a particular row
             mycolumn (column): column object to constrain the search to a particular column
+            match (str): 'auto' to match text as substring or regular expression, 'literal' for substring only, 'regex' for regular expression only
             
         Returns:
             page_parser object of the found page, else None
         
         """
         
-        for page in self.page_list:
-            if page.find(text = text, constraint = constraint, mybox = mybox, myrow = myrow, mycolumn = mycolumn):
+        for _, page in self._iter_pages(text, match):
+            if page.find(text = text, constraint = constraint, mybox = mybox, myrow = myrow, mycolumn = mycolumn, match = match) != None:
                 return page
             
         return None
     
-    def find_page_all(self, text = "", constraint = None, mybox = None, myrow = row(), mycolumn = column()):
+    def find_page_all(self, text = "", constraint = None, mybox = None, myrow = row(), mycolumn = column(), match = 'auto'):
         """
         Find all pages from the pdf containing a particular text within constraints
         
@@ -756,6 +3296,7 @@ class pdf_parser():
             mybox (box): box object for searching within a particular box
             myrow (row): row object to constrain the search to a particular row
             mycolumn (column): column object to constrain the search to a particular column
+            match (str): 'auto' to match text as substring or regular expression, 'literal' for substring only, 'regex' for regular expression only
             
         Returns:
             list of page_parser objects of the found pages, else empty-list
@@ -763,8 +3304,323 @@ class pdf_parser():
         """
         
         found_page_list = []
-        for page in self.page_list:
-            if page.find(text = text, constraint = constraint, mybox = mybox, myrow = myrow, mycolumn = mycolumn):
+        for _, page in self._iter_pages(text, match):
+            if page.find(text = text, constraint = constraint, mybox = mybox, myrow = myrow, mycolumn = mycolumn, match = match) != None:
                 found_page_list.append(page)
             
-        return found_page_list
\ No newline at end of file
+        return found_page_list
+
+class stored_parser(pdf_parser):
+    """
+    pdf_parser over page layouts of a layout_store, made by pdf_parser.load.
+    Page numbers and selected pages are those of the saved parser, methods needing the pdf file, as page streams, revisions, image data and OCR, raise ValueError.
+    """
+    
+    def __init__(self, source, lazy = True, index = False, instrument = None):
+        self.store = layout_store(source)
+        # The profile of the saved parser is not stored, so text_analysis stays unknown.
+        self._init_state(lazy, None, index, True, self.store.keep_chars, instrument)
+        
+        # Pages of the document are only counted, the layouts of the saved ones come from the store.
+        self.pdf_pages = [None] * self.store.no_pages
+        self._select_pages(self.store.pagenos)
+        
+        if not lazy:
+            for pageno in self.pagenos:
+                self._load_page(pageno)
+                
+    def close(self):
+        self.store.close()
+        
+    @property
+    def pdf_reader(self):
+        self._no_file()
+    
+    def _analyze_page(self, pageno):
+        return self.store.get_layout(pageno)
+    
+    def _no_file(self):
+        raise ValueError('The pdf file is not available from a saved parser')
+    
+    def _read_content(self):
+        self._no_file()
+        
+    def write_page_streams(self, dest, ranges = None):
+        self._no_file()
+        
+    def get_image_data(self, image, decoded = True):
+        self._no_file()
+        
+    def export_images(self, directory, pagenos = None):
+        self._no_file()
+        
+    def is_image_only(self, pageno):
+        self._no_file()
+        
+    def get_image_only_pagenos(self):
+        self._no_file()
+        
+    def ocr_pages(self, backend = None, pagenos = None, workers = None):
+        self._no_file()
+    
+class batch_result():
+    """Result of a single document processed by parse_batch."""
+    
+    def __init__(self, index, source, result = None, error = None):
+        self.index = index
+        self.source = source
+        self.result = result
+        self.error = error
+        
+    def __repr__(self):
+        return '<batch_result(%d) %s>' % (self.index, 'error=%r' % self.error if self.error is not None else 'ok')
+    
+def get_compact_pages(parser):
+    """Returns list of page_layout objects of all pages of a pdf_parser object, default func of parse_batch."""
+    
+    return [layout if isinstance(layout, page_layout) else compact_layout(layout, text_analysis = parser.text_analysis is not False) for layout in (parser.get__lt_page(i) for i in parser.pagenos)]
+
+def _parse_batch_item(source, func, parser_kwargs):
+    """Parses a single document of a batch in a worker process and returns func applied on its pdf_parser object."""
+    
+    with pdf_parser(source, **parser_kwargs) as parser:
+        return func(parser)
+    
+def _collect_batch(pending):
+    """Waits for at least one pending document of a batch and yields batch_result objects of the finished ones."""
+    
+    done, _ = wait(pending, return_when = FIRST_COMPLETED)
+    for future in done:
+        index, source = pending.pop(future)
+        try:
+            yield batch_result(index, source, result = future.result())
+        except Exception as e:
+            yield batch_result(index, source, error = e)
+            
+def parse_batch(sources, func = get_compact_pages, workers = None, max_in_flight = None, max_tasks_per_child = None, **parser_kwargs):
+    """
+    Parse many pdf documents concurrently in worker processes, yielding results as documents complete.
+    
+    Args:
+        sources (iterable): paths, bytes or binary file-pointers of the pdf files, consumed only as slots become free
+        func (callable): picklable function applied on the pdf_parser object of each document inside the worker, its return value is the result
+        workers (int): number of worker processes, defaults to number of cpus
+        max_in_flight (int): maximum number of documents submitted but not yet yielded, defaults to twice the number of workers
+        max_tasks_per_child (int): number of documents after which a worker process is replaced, to release memory held by pdfminer
+        parser_kwargs: keyword arguments passed to pdf_parser in the workers
+        
+    Returns:
+        generator of batch_result objects in order of completion, with error set instead of result for failed documents,
+        documents pending in the pool when a worker process dies get the BrokenProcessPool error and the pool is replaced
+    """
+    
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+    
+    executor_kwargs = {'max_workers': workers}
+    if max_tasks_per_child is not None:
+        executor_kwargs['max_tasks_per_child'] = max_tasks_per_child
+        
+    executor = ProcessPoolExecutor(**executor_kwargs)
+    try:
+        pending = {}
+        for index, source in enumerate(sources):
+            while len(pending) >= max_in_flight:
+                yield from _collect_batch(pending)
+                
+            try:
+                if isinstance(source, (bytes, bytearray, memoryview)):
+                    item = bytes(source)
+                elif hasattr(source, 'read'):
+                    source.seek(0)
+                    item = source.read()
+                else:
+                    item = os.fspath(source)
+            except Exception as e:
+                yield batch_result(index, source, error = e)
+                continue
+            
+            try:
+                future = executor.submit(_parse_batch_item, item, func, parser_kwargs)
+            except BrokenProcessPool:
+                # A worker process died, failing all documents pending in the pool, the rest are parsed by a new pool.
+                while pending:
+                    yield from _collect_batch(pending)
+                executor.shutdown()
+                executor = ProcessPoolExecutor(**executor_kwargs)
+                future = executor.submit(_parse_batch_item, item, func, parser_kwargs)
+            pending[future] = (index, source)
+            
+        while pending:
+            yield from _collect_batch(pending)
+    finally:
+        executor.shutdown()
+
+_default_executor = None
+
+def _close_abandoned_parser(future):
+    """Done-callback closing the pdf_parser object built by a future whose result is no longer awaited."""
+    
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+def _get_default_executor():
+    """Returns the thread pool shared by async_pdf_parser objects created without an executor."""
+    
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ThreadPoolExecutor(thread_name_prefix = 'async_pdf_parser')
+    return _default_executor
+
+class async_pdf_parser():
+    """
+    Asyncio front-end of pdf_parser, running all parsing in an executor so that the event loop is never blocked.
+    The document is opened in lazy mode by default and every page is analyzed in a separate executor call, so a timeout or
+    cancellation stops the work after the page being analyzed and the executor thread is released.
+    """
+    
+    def __init__(self, parser, executor = None, timeout = None):
+        """
+        Use async_pdf_parser.open to create an object.
+        
+        Args:
+            parser (pdf_parser): wrapped pdf_parser object
+            executor (Executor): executor running the parsing, defaults to a shared thread pool
+            timeout (float): default timeout in seconds of every call, None for no timeout
+        """
+        
+        self.parser = parser
+        self.executor = executor
+        self.timeout = timeout
+        # pdf_parser is not thread-safe, calls on one document are serialized.
+        self._lock = threading.Lock()
+        
+    @classmethod
+    async def open(cls, source, executor = None, timeout = None, **parser_kwargs):
+        """
+        Open a pdf file without blocking the event loop.
+        
+        Args:
+            source (file, str or bytes): file-pointer, path or bytes-like buffer of the pdf file, as taken by pdf_parser
+            executor (Executor): executor running the parsing, defaults to a shared thread pool
+            timeout (float): timeout in seconds of opening and default timeout of later calls, None for no timeout
+            parser_kwargs: keyword arguments passed to pdf_parser, lazy defaults to True
+            
+        Returns:
+            async_pdf_parser object
+        """
+        
+        parser_kwargs.setdefault('lazy', True)
+        executor = executor or _get_default_executor()
+        future = executor.submit(pdf_parser, source, **parser_kwargs)
+        try:
+            parser = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except BaseException:
+            # The executor keeps building the pdf_parser object after a timeout or cancellation, it is closed once built.
+            future.add_done_callback(_close_abandoned_parser)
+            raise
+        return cls(parser, executor, timeout)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+        
+    async def close(self):
+        """Closes the wrapped pdf_parser object once running calls finish."""
+        
+        await self._call(self.parser.close)
+        
+    def _locked(self, func, *args, **kwargs):
+        with self._lock:
+            return func(*args, **kwargs)
+        
+    def _call(self, func, *args, **kwargs):
+        """Returns awaitable running func in the executor while holding the lock of the document."""
+        
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self.executor or _get_default_executor(), functools.partial(self._locked, func, *args, **kwargs))
+    
+    async def _with_timeout(self, coro, timeout):
+        return await asyncio.wait_for(coro, self.timeout if timeout is None else timeout)
+    
+    def get_no_pages(self):
+        """Get number of pages in the pdf file, known without analyzing pages."""
+        
+        return self.parser.get_no_pages()
+    
+    async def get_page(self, pageno, timeout = None):
+        """Get page_parser object of a particular page, see pdf_parser.get_page."""
+        
+        return await self._with_timeout(self._call(self.parser.get_page, pageno), timeout)
+    
+    async def get_page_stream(self, pageno, timeout = None):
+        """Get a particular page as a separate pdf document, see pdf_parser.get_page_stream."""
+        
+        return await self._with_timeout(self._call(self.parser.get_page_stream, pageno), timeout)
+    
+    async def iter_pages(self, timeout = None):
+        """
+        Iterate over page_parser objects of all pages, analyzing one page per executor call, see pdf_parser.iter_pages.
+        
+        Args:
+            timeout (float): timeout in seconds for analyzing each page
+        """
+        
+        pages = self.parser.iter_pages()
+        while True:
+            page = await self._with_timeout(self._call(next, pages, None), timeout)
+            if page is None:
+                return
+            yield page
+            
+    async def _iter_found_pages(self, text, match, kwargs):
+        """Yields page-no and page_parser object of the pages containing the text, analyzing and searching one page per executor call."""
+        
+        def find_next(pages):
+            for pageno, page in pages:
+                return pageno, page, page.find(text = text, match = match, **kwargs)
+            return None
+        
+        if self.parser.index and self.parser.text_index is None:
+            # Pages are analyzed for the text_index one per executor call as well, only tokenizing them is left to build_index.
+            for pageno in self.parser.pagenos:
+                await self._call(self.parser._load_page, pageno)
+            await self._call(self.parser.build_index)
+            
+        pages = self.parser._iter_pages(text, match)
+        while True:
+            found = await self._call(find_next, pages)
+            if found is None:
+                return
+            if found[2] != None:
+                yield found[0], found[1]
+                
+    async def _find_first(self, text, match, kwargs):
+        async for pageno, page in self._iter_found_pages(text, match, kwargs):
+            return pageno, page
+        return None, None
+    
+    async def _find_all(self, text, match, kwargs):
+        return [page async for _, page in self._iter_found_pages(text, match, kwargs)]
+    
+    async def find_page_no(self, text = "", constraint = None, mybox = None, myrow = row(), mycolumn = column(), match = 'auto', timeout = None):
+        """Find a page_no from the pdf containing a particular text within constraints, see pdf_parser.find_page_no."""
+        
+        kwargs = dict(constraint = constraint, mybox = mybox, myrow = myrow, mycolumn = mycolumn)
+        pageno, _ = await self._with_timeout(self._find_first(text, match, kwargs), timeout)
+        return pageno
+    
+    async def find_page(self, text = "", constraint = None, mybox = None, myrow = row(), mycolumn = column(), match = 'auto', timeout = None):
+        """Find a page from the pdf containing a particular text within constraints, see pdf_parser.find_page."""
+        
+        kwargs = dict(constraint = constraint, mybox = mybox, myrow = myrow, mycolumn = mycolumn)
+        _, page = await self._with_timeout(self._find_first(text, match, kwargs), timeout)
+        return page
+    
+    async def find_page_all(self, text = "", constraint = None, mybox = None, myrow = row(), mycolumn = column(), match = 'auto', timeout = None):
+        """Find all pages from the pdf containing a particular text within constraints, see pdf_parser.find_page_all."""
+        
+        kwargs = dict(constraint = constraint, mybox = mybox, myrow = myrow, mycolumn = mycolumn)
+        return await self._with_timeout(self._find_all(text, match, kwargs), timeout)